@@ -4,6 +4,7 @@ import pandas as pd
 import numpy as np
 from typing import Optional, List
 from dataclasses import dataclass, field
+from datetime import date, datetime
 import csv
 
 from ...exceptions import FormatDetectionError, FileError
@@ -48,6 +49,12 @@ class XLSXHandler(FormatHandler):
         return format_type in ['xlsx', 'xlsm']
 
     def parse(self, file_path: Path, sheet: Optional[str], options: ParseOptions) -> pd.DataFrame:
+        # calamine has no merged-cell or hidden-row information, only plain reads can use it
+        if options.merge_strategy == 'skip' and not options.ignore_hidden and not options.range:
+            data = self._read_with_calamine(file_path, sheet)
+            if data is not None:
+                return self._build_dataframe(data, options)
+
         try:
             import openpyxl
         except ImportError:
@@ -100,6 +107,9 @@ class XLSXHandler(FormatHandler):
 
         wb.close()
 
+        return self._build_dataframe(data, options)
+
+    def _build_dataframe(self, data: list, options: ParseOptions) -> pd.DataFrame:
         if not data:
             return pd.DataFrame()
 
@@ -131,6 +141,44 @@ class XLSXHandler(FormatHandler):
 
         return df
 
+    def _read_with_calamine(self, file_path: Path, sheet: Optional[str]) -> Optional[list]:
+        try:
+            from python_calamine import CalamineWorkbook
+        except ImportError:
+            return None
+
+        try:
+            wb = CalamineWorkbook.from_path(str(file_path))
+            ws = wb.get_sheet_by_name(sheet) if sheet else wb.get_sheet_by_index(0)
+            # Keep leading blank rows/columns so skip_rows and col_N line up with openpyxl
+            rows = ws.to_python(skip_empty_area=False)
+        except Exception as e:
+            log.debug("calamine_failed_trying_openpyxl", file=str(file_path), error=str(e))
+            return None
+
+        return [[self._calamine_value(value) for value in row] for row in rows]
+
+    @staticmethod
+    def _calamine_value(value):
+        if value == "":
+            return None
+        # calamine reports midnight datetimes as date; openpyxl always gives datetime
+        if type(value) is date:
+            return datetime(value.year, value.month, value.day)
+        return value
+
+    def _calamine_sheet_names(self, file_path: Path) -> Optional[List[str]]:
+        try:
+            from python_calamine import CalamineWorkbook
+        except ImportError:
+            return None
+
+        try:
+            return CalamineWorkbook.from_path(str(file_path)).sheet_names
+        except Exception as e:
+            log.debug("calamine_failed_trying_openpyxl", file=str(file_path), error=str(e))
+            return None
+
     def _handle_merged_cells(self, ws, strategy: str):
         import openpyxl
 
@@ -161,6 +209,10 @@ class XLSXHandler(FormatHandler):
         return df
 
     def get_sheets(self, file_path: Path) -> List[str]:
+        sheets = self._calamine_sheet_names(file_path)
+        if sheets is not None:
+            return sheets
+
         errors_encountered = []
         try:
             import openpyxl
@@ -194,7 +194,7 @@ class ExcelLoader:
 
                 import hashlib
                 temp_table = f"temp_{hashlib.md5(table_name.encode()).hexdigest()[:8]}"
-                self.conn.register(temp_table, df)
+                self._register_frame(temp_table, df)
 
                 self.conn.execute(f"""
                     CREATE OR REPLACE VIEW "{table_name}" AS
@@ -330,9 +330,12 @@ class ExcelLoader:
                 if override.unpivot:
                     df = self._apply_unpivot(df, override.unpivot)
 
+            if override.normalize_columns:
+                df = self._apply_normalized_columns(df, override.normalize_columns)
+
             import hashlib
             temp_view = f"temp_{hashlib.md5(table_name.encode()).hexdigest()[:8]}"
-            self.conn.register(temp_view, df)
+            self._register_frame(temp_view, df)
             self.conn.execute(f"""
                 CREATE OR REPLACE VIEW "{table_name}" AS
                 SELECT * FROM {temp_view}
@@ -390,6 +393,22 @@ class ExcelLoader:
 
         return data_rows
 
+    def _register_frame(self, name: str, df: pd.DataFrame):
+        # Arrow tables scan without unboxing object columns row by row
+        try:
+            import pyarrow as pa
+        except ImportError:
+            self.conn.register(name, df)
+            return
+
+        try:
+            data = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowException, TypeError, ValueError) as e:
+            log.debug("arrow_conversion_failed", table=name, error=str(e))
+            data = df
+
+        self.conn.register(name, data)
+
     def _apply_type_hints(self, df: pd.DataFrame, type_hints: dict[str, str]) -> pd.DataFrame:
         for col_name, type_hint in type_hints.items():
             if col_name not in df.columns:
@@ -415,6 +434,25 @@ class ExcelLoader:
 
         return df
 
+    def _apply_normalized_columns(self, df: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+        for col_name in columns:
+            if col_name not in df.columns:
+                log.warn("normalize_column_missing", column=col_name)
+                continue
+
+            df[f"__norm_{col_name}"] = (
+                df[col_name].astype("string")
+                .str.normalize("NFKD")
+                .str.encode("ascii", "ignore")
+                .str.decode("ascii")
+                .str.lower()
+                .str.replace(r"[^\w\s]", "", regex=True)
+                .str.replace(r"\s+", " ", regex=True)
+                .str.strip()
+            )
+
+        return df
+
     def _apply_unpivot(self, df: pd.DataFrame, unpivot_config: dict) -> pd.DataFrame:
         id_vars = unpivot_config.get("id_vars", [])
         value_vars = unpivot_config.get("value_vars", [])
@@ -3,8 +3,13 @@ from pathlib import Path
 from typing import Any, Optional
 
 
-@dataclass
-class TableMeta:
+class _ListEntryCache:
+    # Declared outside the dataclass so the cache is not a field and stays out of asdict()
+    __slots__ = ("_list_entry",)
+
+
+@dataclass(slots=True)
+class TableMeta(_ListEntryCache):
     table_name: str
     file: str
     relpath: str
@@ -14,15 +19,35 @@ class TableMeta:
     alias: str
     est_rows: int = 0
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name != "_list_entry":
+            object.__setattr__(self, "_list_entry", None)
+
+    def list_entry(self) -> dict:
+        entry = getattr(self, "_list_entry", None)
+        if entry is None:
+            entry = {
+                "table": self.table_name,
+                "source": "file",
+                "file": self.file,
+                "relpath": self.relpath,
+                "sheet": self.sheet,
+                "mode": self.mode,
+                "est_rows": self.est_rows,
+            }
+            self._list_entry = entry
+        return dict(entry)
+
 
-@dataclass
+@dataclass(slots=True)
 class MergeHandlingConfig:
     strategy: str = 'fill'
     header_strategy: str = 'span'
     log_warnings: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class LocaleConfig:
     locale: Optional[str] = None
     decimal_separator: Optional[str] = None
@@ -31,7 +56,7 @@ class LocaleConfig:
     auto_detect: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class SheetOverride:
     skip_rows: int = 0
     header_rows: int = 1
@@ -48,9 +73,10 @@ class SheetOverride:
     drop_conditions: list[dict] = field(default_factory=list)
     extract_table: Optional[int] = None
     table_range: Optional[str] = None
+    normalize_columns: list[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class StructureInfo:
     data_start_row: int
     data_end_row: int
@@ -79,10 +105,11 @@ class StructureInfo:
     suggested_overrides: dict
 
 
-@dataclass
+@dataclass(slots=True)
 class LoadConfig:
     root: Path
     alias: str
     include_glob: list[str]
     exclude_glob: list[str]
     overrides: dict[str, dict] = field(default_factory=dict)
+    default_sheet_overrides: dict = field(default_factory=dict)
@@ -1,5 +1,8 @@
+import os
 import re
+import glob
 import time
+import queue
 import threading
 import tempfile
 import contextlib
@@ -15,6 +18,7 @@ from starlette.middleware import Middleware
 from . import __version__
 from .models import TableMeta, SheetOverride, LoadConfig
 from .utils.naming import TableRegistry
+from .utils.paths import compile_glob, compile_exclude_globs, walk_files
 from .loading.loader import ExcelLoader
 from .utils.watcher import FileWatcher
 from .utils.auth import APIKeyMiddleware, get_api_key_from_env
@@ -38,6 +42,34 @@ _registry_lock          = threading.RLock()
 _views_lock             = threading.RLock()
 _db_path: Optional[str] = None
 _use_http_mode          = False
+_read_pool: Optional[queue.Queue] = None
+
+_ALIAS_CLEAN_RE         = re.compile(r"[^a-z0-9_]+")
+_ALIAS_DEDUP_RE         = re.compile(r"_+")
+_VIEW_NAME_RE           = re.compile(r"^[a-z0-9_]+$", re.IGNORECASE)
+_VIEW_FILE_PREFIX       = ".view_"
+
+# Same normalization the loader writes into __norm_<col> columns (see normalize_columns)
+_NAME_NORM_MACRO = r"""
+    CREATE OR REPLACE MACRO name_norm(s) AS
+    trim(regexp_replace(regexp_replace(lower(strip_accents(s)), '[^\w\s]', '', 'g'), '\s+', ' ', 'g'))
+"""
+
+_FILES_VIEW_COLUMNS = (
+    ("file_path", "VARCHAR"),
+    ("relpath", "VARCHAR"),
+    ("sheet_count", "BIGINT"),
+    ("total_rows", "BIGINT"),
+)
+_TABLES_VIEW_COLUMNS = (
+    ("table_name", "VARCHAR"),
+    ("file_path", "VARCHAR"),
+    ("relpath", "VARCHAR"),
+    ("sheet_name", "VARCHAR"),
+    ("mode", "VARCHAR"),
+    ("est_rows", "BIGINT"),
+    ("mtime", "DOUBLE"),
+)
 
 
 def init_server(use_http_mode: bool = False):
@@ -47,47 +79,90 @@ def init_server(use_http_mode: bool = False):
     registry = TableRegistry()
 
     if use_http_mode:
-        import os
-        import time
         temp_dir = tempfile.gettempdir()
         _db_path = os.path.join(temp_dir, f"mcp_excel_{os.getpid()}_{int(time.time() * 1000000)}.duckdb")
+        # Macros live in the database file, so every later connection sees them
+        with duckdb.connect(_db_path) as setup_conn:
+            setup_conn.execute(_NAME_NORM_MACRO)
     else:
         _db_path = ":memory:"
         if not conn:
             conn = duckdb.connect(":memory:")
+        conn.execute(_NAME_NORM_MACRO)
 
     if use_http_mode:
         loader = None
+        _open_read_pool(os.cpu_count() or 4)
     else:
         loader = ExcelLoader(conn, registry) if conn else None
+        _close_read_pool()
+
+
+def _load_excel_extension(target_conn: duckdb.DuckDBPyConnection, install: bool = False):
+    operation = "INSTALL" if install else "LOAD"
+    try:
+        if install:
+            target_conn.execute("INSTALL excel")
+        target_conn.execute("LOAD excel")
+    except duckdb.ExtensionException:
+        pass
+    except duckdb.IOException as e:
+        log.error("extension_install_failed", error=str(e), reason="io_error")
+        raise ExtensionError(
+            "Failed to install DuckDB excel extension. Check disk space and permissions.",
+            extension_name="excel",
+            operation=operation,
+            data={"error": str(e)}
+        )
+    except Exception as e:
+        log.error("extension_install_unexpected", error=str(e), error_type=type(e).__name__)
+        raise ExtensionError(
+            f"Unexpected error installing excel extension: {e}",
+            extension_name="excel",
+            operation=operation,
+            data={"error_type": type(e).__name__}
+        )
+
+
+def _open_read_pool(size: int):
+    global _read_pool
+
+    _close_read_pool()
+
+    pool = queue.Queue()
+    for index in range(size):
+        pool_conn = duckdb.connect(_db_path)
+        _load_excel_extension(pool_conn, install=(index == 0))
+        pool.put(pool_conn)
+
+    _read_pool = pool
+
+
+def _close_read_pool():
+    global _read_pool
+
+    if _read_pool is None:
+        return
+
+    while True:
+        try:
+            pool_conn = _read_pool.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            pool_conn.close()
+        except Exception as e:
+            log.warn("read_pool_close_failed", error=str(e))
+
+    _read_pool = None
 
 
 @contextlib.contextmanager
 def get_connection():
     global conn
     if _use_http_mode:
+        # Extensions load per database instance, which the read pool keeps open.
         local_conn = duckdb.connect(_db_path)
-        try:
-            local_conn.execute("INSTALL excel")
-            local_conn.execute("LOAD excel")
-        except duckdb.ExtensionException:
-            pass
-        except duckdb.IOException as e:
-            log.error("extension_install_failed", error=str(e), reason="io_error")
-            raise ExtensionError(
-                "Failed to install DuckDB excel extension. Check disk space and permissions.",
-                extension_name="excel",
-                operation="INSTALL",
-                data={"error": str(e)}
-            )
-        except Exception as e:
-            log.error("extension_install_unexpected", error=str(e), error_type=type(e).__name__)
-            raise ExtensionError(
-                f"Unexpected error installing excel extension: {e}",
-                extension_name="excel",
-                operation="INSTALL",
-                data={"error_type": type(e).__name__}
-            )
         try:
             yield local_conn
         finally:
@@ -95,9 +170,26 @@ def get_connection():
     else:
         if conn is None:
             conn = duckdb.connect(_db_path)
+            conn.execute(_NAME_NORM_MACRO)
         yield conn
 
 
+@contextlib.contextmanager
+def get_read_connection():
+    # Pooled connections only exist in HTTP mode: in stdio mode views are backed by
+    # DataFrames registered on the shared connection, which other cursors cannot see.
+    if _read_pool is None:
+        with get_connection() as read_conn:
+            yield read_conn
+        return
+
+    read_conn = _read_pool.get()
+    try:
+        yield read_conn
+    finally:
+        _read_pool.put(read_conn)
+
+
 def validate_root_path(user_path: str) -> Path:
     path = Path(user_path).resolve()
 
@@ -113,15 +205,15 @@ def validate_root_path(user_path: str) -> Path:
 def _generate_alias_from_path(root: Path) -> str:
     alias = root.name or "excel"
     alias = alias.lower()
-    alias = re.sub(r"[^a-z0-9_]+", "_", alias)
-    alias = re.sub(r"_+", "_", alias)
+    alias = _ALIAS_CLEAN_RE.sub("_", alias)
+    alias = _ALIAS_DEDUP_RE.sub("_", alias)
     alias = alias.strip("_")
 
     return alias if alias else "excel"
 
 
 def _get_view_file_path(root: Path, view_name: str) -> Path:
-    return root / f".view_{view_name}"
+    return root / f"{_VIEW_FILE_PREFIX}{view_name}"
 
 
 def _validate_view_name(view_name: str) -> None:
@@ -134,21 +226,33 @@ def _validate_view_name(view_name: str) -> None:
     if view_name.startswith("_"):
         raise ValueError("View names cannot start with underscore (reserved)")
 
-    if not re.match(r"^[a-z0-9_]+$", view_name, re.IGNORECASE):
+    if not _VIEW_NAME_RE.match(view_name):
         raise ValueError("View names can only contain letters, numbers, and underscores")
 
 
+def _build_sql_preview(sql: str) -> str:
+    if len(sql) > 100:
+        return sql[:100] + "..."
+    return sql
+
+
 def _load_views_from_disk(root: Path) -> int:
     loaded_count = 0
 
-    for view_file in root.glob(".view_*"):
-        view_name = view_file.name[6:]
+    with os.scandir(root) as entries:
+        view_entries = [
+            entry for entry in entries
+            if entry.name.startswith(_VIEW_FILE_PREFIX) and entry.is_file(follow_symlinks=False)
+        ]
+
+    for entry in view_entries:
+        view_name = entry.name[len(_VIEW_FILE_PREFIX):]
 
         try:
-            sql = view_file.read_text().strip()
+            sql = Path(entry.path).read_text().strip()
 
             if not sql:
-                log.warn("view_file_empty", view=view_name, file=str(view_file))
+                log.warn("view_file_empty", view=view_name, file=entry.path)
                 continue
 
             with get_connection() as conn:
@@ -157,15 +261,16 @@ def _load_views_from_disk(root: Path) -> int:
             with _views_lock:
                 views[view_name] = {
                     "sql": sql,
-                    "file": str(view_file),
-                    "created_at": view_file.stat().st_mtime
+                    "sql_preview": _build_sql_preview(sql),
+                    "file": entry.path,
+                    "created_at": entry.stat().st_mtime
                 }
 
             loaded_count += 1
-            log.info("view_loaded", view=view_name, file=str(view_file))
+            log.info("view_loaded", view=view_name, file=entry.path)
 
         except Exception as e:
-            log.warn("view_load_failed", view=view_name, file=str(view_file), error=str(e))
+            log.warn("view_load_failed", view=view_name, file=entry.path, error=str(e))
 
     return loaded_count
 
@@ -180,16 +285,10 @@ def _parse_sheet_override(override_dict: dict) -> SheetOverride:
         column_renames=override_dict.get("column_renames", {}),
         type_hints=override_dict.get("type_hints", {}),
         unpivot=override_dict.get("unpivot", {}),
+        normalize_columns=override_dict.get("normalize_columns", []),
     )
 
 
-def _should_exclude_file(file_path: Path, exclude_patterns: list[str]) -> bool:
-    for pattern in exclude_patterns:
-        if file_path.match(pattern):
-            return True
-    return False
-
-
 def _prepare_system_view_data(catalog_dict: dict, alias: str) -> tuple[dict, list]:
     files_data = {}
     tables_data = []
@@ -223,40 +322,47 @@ def _prepare_system_view_data(catalog_dict: dict, alias: str) -> tuple[dict, lis
     return files_data, tables_data
 
 
-def _register_dataframe_view(conn, temp_table_name: str, view_name: str, dataframe):
-    import pandas as pd
+def _sql_literal(value) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    text = str(value).replace("'", "''")
+    return f"'{text}'"
 
-    try:
-        conn.unregister(temp_table_name)
-    except duckdb.CatalogException:
-        log.debug("temp_table_not_found", table=temp_table_name)
-    except Exception as e:
-        log.warn("temp_table_cleanup_failed", table=temp_table_name, error=str(e))
 
-    conn.register(temp_table_name, dataframe)
-    conn.execute(f'CREATE OR REPLACE VIEW "{view_name}" AS SELECT * FROM {temp_table_name}')
+def _create_values_view(conn, view_name: str, columns: tuple, rows: list[dict]):
+    column_names = ", ".join(f'"{name}"' for name, _ in columns)
+    projection = ", ".join(f'CAST("{name}" AS {sql_type}) AS "{name}"' for name, sql_type in columns)
+    values_sql = ", ".join(
+        "(" + ", ".join(_sql_literal(row[name]) for name, _ in columns) + ")"
+        for row in rows
+    )
 
+    conn.execute(
+        f'CREATE OR REPLACE VIEW "{view_name}" AS '
+        f"SELECT {projection} FROM (VALUES {values_sql}) AS t({column_names})"
+    )
 
-def _create_system_views(alias: str):
-    import pandas as pd
 
+def _create_system_views(alias: str):
     with _catalog_lock:
         files_data, tables_data = _prepare_system_view_data(catalog, alias)
 
+    if not files_data and not tables_data:
+        return
+
     files_view_name = f"{alias}.__files"
     tables_view_name = f"{alias}.__tables"
-    temp_files_table = f"temp_files_{alias}"
-    temp_tables_table = f"temp_tables_{alias}"
 
     with get_connection() as conn:
         try:
             if files_data:
-                files_df = pd.DataFrame(list(files_data.values()))
-                _register_dataframe_view(conn, temp_files_table, files_view_name, files_df)
+                _create_values_view(conn, files_view_name, _FILES_VIEW_COLUMNS,
+                                    list(files_data.values()))
 
             if tables_data:
-                tables_df = pd.DataFrame(tables_data)
-                _register_dataframe_view(conn, temp_tables_table, tables_view_name, tables_df)
+                _create_values_view(conn, tables_view_name, _TABLES_VIEW_COLUMNS, tables_data)
 
             log.info("system_views_created", alias=alias,
                     files_view=files_view_name, tables_view=tables_view_name)
@@ -264,16 +370,91 @@ def _create_system_views(alias: str):
             log.warn("system_views_failed", alias=alias, error=str(e))
 
 
+def _sheet_override_dict(file_overrides: dict, sheet: str, default_sheet_overrides: dict) -> dict:
+    # Per-sheet entries win over the load-wide default, key by key
+    sheet_override_dict = file_overrides.get("sheet_overrides", {}).get(sheet) or {}
+    if default_sheet_overrides:
+        return {**default_sheet_overrides, **sheet_override_dict}
+    return sheet_override_dict
+
+
+def _load_file(loader: ExcelLoader, file_path: Path, relative_path: str,
+               alias: str, file_overrides: dict,
+               default_sheet_overrides: dict = None) -> tuple[int, int]:
+    sheets_loaded = 0
+    total_rows = 0
+
+    sheet_names = loader.get_sheet_names(file_path)
+
+    for sheet_name in sheet_names:
+        sheet_override_dict = _sheet_override_dict(file_overrides, sheet_name, default_sheet_overrides)
+        sheet_override = None
+
+        if sheet_override_dict:
+            sheet_override = _parse_sheet_override(sheet_override_dict)
+
+        table_metas = loader.load_sheet(file_path, relative_path,
+                                       sheet_name, alias, sheet_override)
+
+        for table_meta in table_metas:
+            with _catalog_lock:
+                catalog[table_meta.table_name] = table_meta
+
+            sheets_loaded += 1
+            total_rows += table_meta.est_rows
+
+            log.info("table_created", table=table_meta.table_name,
+                    file=relative_path, sheet=sheet_name,
+                    rows=table_meta.est_rows, mode=table_meta.mode)
+
+    return sheets_loaded, total_rows
+
+
+def _match_files(root: Path, include_glob: list[str], exclude_glob: list[str]) -> list[tuple[str, Path]]:
+    """
+    Files under root in include-pattern order, each listed once even if several patterns match.
+    """
+    root_files = list(walk_files(str(root)))
+    exclude_re = compile_exclude_globs(exclude_glob)
+
+    matched = {}
+    for pattern in include_glob:
+        include_re = compile_glob(pattern)
+
+        for relative_path, entry in root_files:
+            if relative_path in matched:
+                continue
+
+            match_path = relative_path.replace(os.sep, "/")
+            if not include_re.match(match_path):
+                continue
+
+            if exclude_re is not None and exclude_re.match(match_path):
+                continue
+
+            matched[relative_path] = Path(entry.path)
+
+    return list(matched.items())
+
+
 def load_dir(
     path: str,
     alias: str = None,
     include_glob: list[str] = None,
     exclude_glob: list[str] = None,
     overrides: dict = None,
+    default_sheet_overrides: dict = None,
 ) -> dict:
+    """
+    Load every matching file under path as tables of one alias.
+
+    default_sheet_overrides (e.g. {"header_rows": 1}) applies to every sheet of every
+    file; entries under overrides[relpath]["sheet_overrides"][sheet] take precedence.
+    """
     include_glob = include_glob or ["**/*.xlsx", "**/*.xlsm", "**/*.xls", "**/*.csv", "**/*.tsv"]
     exclude_glob = exclude_glob or []
     overrides = overrides or {}
+    default_sheet_overrides = default_sheet_overrides or {}
 
     root = validate_root_path(path)
 
@@ -293,55 +474,29 @@ def load_dir(
         include_glob=include_glob,
         exclude_glob=exclude_glob,
         overrides=overrides,
+        default_sheet_overrides=default_sheet_overrides,
     )
     with _load_configs_lock:
         load_configs[alias] = load_config
 
+    matched_files = _match_files(root, include_glob, exclude_glob)
+
     with get_connection() as conn:
         loader = ExcelLoader(conn, registry)
 
-        for pattern in include_glob:
-            for file_path in root.glob(pattern):
-                if not file_path.is_file():
-                    continue
-
-                relative_path = str(file_path.relative_to(root))
-
-                if _should_exclude_file(file_path, exclude_glob):
-                    continue
-
-                try:
-                    sheet_names = loader.get_sheet_names(file_path)
-                    file_overrides = overrides.get(relative_path, {})
-                    sheet_overrides_dict = file_overrides.get("sheet_overrides", {})
-
-                    for sheet_name in sheet_names:
-                        sheet_override_dict = sheet_overrides_dict.get(sheet_name)
-                        sheet_override = None
-
-                        if sheet_override_dict:
-                            sheet_override = _parse_sheet_override(sheet_override_dict)
-
-                        table_metas = loader.load_sheet(file_path, relative_path,
-                                                       sheet_name, alias, sheet_override)
-
-                        for table_meta in table_metas:
-                            with _catalog_lock:
-                                catalog[table_meta.table_name] = table_meta
-
-                            sheets_loaded += 1
-                            total_rows += table_meta.est_rows
-
-                            log.info("table_created", table=table_meta.table_name,
-                                    file=relative_path, sheet=sheet_name,
-                                    rows=table_meta.est_rows, mode=table_meta.mode)
-
-                    files_loaded += 1
+        for relative_path, file_path in matched_files:
+            try:
+                file_sheets, file_rows = _load_file(loader, file_path, relative_path, alias,
+                                                    overrides.get(relative_path, {}),
+                                                    default_sheet_overrides)
+                sheets_loaded += file_sheets
+                total_rows += file_rows
+                files_loaded += 1
 
-                except Exception as e:
-                    error_msg = str(e)
-                    log.warn("load_failed", file=relative_path, error=error_msg)
-                    failed_files.append({"file": relative_path, "error": error_msg})
+            except Exception as e:
+                error_msg = str(e)
+                log.warn("load_failed", file=relative_path, error=error_msg)
+                failed_files.append({"file": relative_path, "error": error_msg})
 
     _create_system_views(alias)
 
@@ -371,6 +526,69 @@ def load_dir(
     return result
 
 
+def add_file(path: str, alias: str = None, overrides: dict = None) -> dict:
+    """
+    Load a single file without rescanning its directory.
+
+    The file joins an existing alias when it lives under that alias's root, otherwise a
+    new alias rooted at the file's directory is created. overrides is the per-file entry
+    (e.g. {"sheet_overrides": {...}}) and is kept for later refreshes.
+    """
+    file_path = Path(path).resolve()
+
+    if not file_path.exists():
+        raise ValueError(f"Path {file_path} does not exist")
+
+    if not file_path.is_file():
+        raise ValueError(f"Path {file_path} is not a file")
+
+    if alias is None:
+        alias = _generate_alias_from_path(file_path.parent)
+
+    with _load_configs_lock:
+        load_config = load_configs.get(alias)
+        if load_config is None:
+            load_config = LoadConfig(root=file_path.parent, alias=alias,
+                                     include_glob=[], exclude_glob=[], overrides={})
+
+        try:
+            relative_path = str(file_path.relative_to(load_config.root))
+        except ValueError:
+            raise ValueError(f"Path {file_path} is outside root {load_config.root} of alias {alias}")
+
+        match_path = relative_path.replace(os.sep, "/")
+        exclude_re = compile_exclude_globs(load_config.exclude_glob)
+        if exclude_re is not None and exclude_re.match(match_path):
+            raise ValueError(f"Path {file_path} matches exclude_glob of alias {alias}")
+
+        if overrides is None:
+            overrides = load_config.overrides.get(relative_path, {})
+
+    log.info("add_file_start", file=relative_path, alias=alias)
+
+    with get_connection() as conn:
+        loader = ExcelLoader(conn, registry)
+        sheets_loaded, total_rows = _load_file(loader, file_path, relative_path, alias, overrides,
+                                               load_config.default_sheet_overrides)
+
+    # Only record the file once it has loaded, so refreshes never chase a failed add
+    with _load_configs_lock:
+        load_config = load_configs.setdefault(alias, load_config)
+        if not any(compile_glob(pattern).match(match_path) for pattern in load_config.include_glob):
+            load_config.include_glob = load_config.include_glob + [glob.escape(match_path)]
+        load_config.overrides = {**load_config.overrides, relative_path: overrides}
+
+    _create_system_views(alias)
+
+    return {
+        "alias": alias,
+        "file": str(file_path),
+        "relpath": relative_path,
+        "sheets_count": sheets_loaded,
+        "rows_estimate": total_rows,
+    }
+
+
 def query(
     sql: str,
     max_rows: int = 10000,
@@ -380,7 +598,7 @@ def query(
     interrupted = [False]
     transaction_started = [False]
 
-    with get_connection() as conn:
+    with get_read_connection() as conn:
         def timeout_handler():
             interrupted[0] = True
             try:
@@ -447,51 +665,41 @@ def query(
 
 
 def list_tables(alias: str = None) -> dict:
-    tables = []
-
     with _catalog_lock:
-        for table_name, table_meta in catalog.items():
-            if alias and not table_name.startswith(f"{alias}."):
-                continue
-
-            tables.append({
-                "table": table_name,
-                "source": "file",
-                "file": table_meta.file,
-                "relpath": table_meta.relpath,
-                "sheet": table_meta.sheet,
-                "mode": table_meta.mode,
-                "est_rows": table_meta.est_rows,
-            })
+        if alias:
+            prefix = f"{alias}."
+            tables = [
+                table_meta.list_entry() for table_name, table_meta in catalog.items()
+                if table_name.startswith(prefix)
+            ]
+        else:
+            tables = [table_meta.list_entry() for table_meta in catalog.values()]
 
     view_list = []
     with _views_lock:
-        for view_name, view_info in views.items():
+        if views:
             with get_connection() as conn:
-                try:
-                    row_count_result = conn.execute(f'SELECT COUNT(*) FROM "{view_name}"').fetchone()
-                    est_rows = row_count_result[0] if row_count_result else 0
-                except duckdb.CatalogException as e:
-                    log.debug("view_count_catalog_error", view=view_name, error=str(e))
-                    est_rows = 0
-                except duckdb.BinderException as e:
-                    log.warn("view_count_binder_error", view=view_name, error=str(e))
-                    est_rows = 0
-                except Exception as e:
-                    log.error("view_count_unexpected", view=view_name, error=str(e))
-                    est_rows = 0
-
-            sql_preview = view_info["sql"][:100]
-            if len(view_info["sql"]) > 100:
-                sql_preview += "..."
-
-            view_list.append({
-                "name": view_name,
-                "source": "view",
-                "sql": sql_preview,
-                "est_rows": est_rows,
-                "file": view_info["file"]
-            })
+                for view_name, view_info in views.items():
+                    try:
+                        row_count_result = conn.execute(f'SELECT COUNT(*) FROM "{view_name}"').fetchone()
+                        est_rows = row_count_result[0] if row_count_result else 0
+                    except duckdb.CatalogException as e:
+                        log.debug("view_count_catalog_error", view=view_name, error=str(e))
+                        est_rows = 0
+                    except duckdb.BinderException as e:
+                        log.warn("view_count_binder_error", view=view_name, error=str(e))
+                        est_rows = 0
+                    except Exception as e:
+                        log.error("view_count_unexpected", view=view_name, error=str(e))
+                        est_rows = 0
+
+                    view_list.append({
+                        "name": view_name,
+                        "source": "view",
+                        "sql": view_info["sql_preview"],
+                        "est_rows": est_rows,
+                        "file": view_info["file"]
+                    })
 
     return {
         "tables": tables,
@@ -499,6 +707,28 @@ def list_tables(alias: str = None) -> dict:
     }
 
 
+def get_table(name_part: str, alias: str = None) -> str:
+    """
+    Resolve a loaded table from part of its name.
+
+    A whole dotted segment ("invoices" in "excel.reconciliation.invoices") wins over a
+    plain substring; anything other than exactly one match raises ValueError.
+    """
+    with _catalog_lock:
+        prefix = f"{alias}." if alias else ""
+        names = [table_name for table_name in catalog if table_name.startswith(prefix)]
+
+    matches = [table_name for table_name in names if name_part in table_name.split(".")]
+    if not matches:
+        matches = [table_name for table_name in names if name_part in table_name]
+
+    if len(matches) != 1:
+        found = "no table" if not matches else f"{len(matches)} tables ({', '.join(sorted(matches))})"
+        raise ValueError(f"Expected one table matching '{name_part}', found {found}")
+
+    return matches[0]
+
+
 def get_schema(table_name: str) -> dict:
     is_view = False
     with _catalog_lock:
@@ -574,6 +804,7 @@ def _refresh_full(alias: str) -> dict:
             include_glob=load_config.include_glob,
             exclude_glob=load_config.exclude_glob,
             overrides=load_config.overrides,
+            default_sheet_overrides=load_config.default_sheet_overrides,
         )
         files_count = result.get("files_count", 0)
         sheets_count = result.get("sheets_count", 0)
@@ -700,11 +931,10 @@ def _refresh_incremental(alias: str) -> dict:
                             file=str(file_path), root=str(load_config.root))
                     continue
 
-                sheet_override_dict = (
-                    load_config.overrides
-                    .get(relative_path, {})
-                    .get("sheet_overrides", {})
-                    .get(table_meta.sheet)
+                sheet_override_dict = _sheet_override_dict(
+                    load_config.overrides.get(relative_path, {}),
+                    table_meta.sheet,
+                    load_config.default_sheet_overrides,
                 )
 
                 sheet_override = None
@@ -757,7 +987,7 @@ def create_view(view_name: str, sql: str) -> dict:
         if not load_configs:
             raise RuntimeError("No data loaded. Call load_dir first.")
 
-        root_path = list(load_configs.values())[0].root
+        root_path = next(iter(load_configs.values())).root
 
     sql_clean = sql.strip()
     if not sql_clean.upper().startswith("SELECT"):
@@ -779,6 +1009,7 @@ def create_view(view_name: str, sql: str) -> dict:
     with _views_lock:
         views[view_name] = {
             "sql": sql_clean,
+            "sql_preview": _build_sql_preview(sql_clean),
             "file": str(view_file),
             "created_at": view_file.stat().st_mtime
         }
@@ -868,6 +1099,8 @@ def tool_query(sql: str, max_rows: int = 10000, timeout_ms: int = 60000) -> dict
 
     Table names need quotes: SELECT * FROM "examples.sales.summary"
     View names don't: SELECT * FROM high_value_sales
+    Computed patterns: contains(col, x) / starts_with(col, x) instead of LIKE '%' || x || '%'
+    Fuzzy name joins: name_norm(a.Name) = name_norm(b.Name) (lowercase, no accents/punctuation)
 
     Parameters:
     - sql: SELECT query (DuckDB with CTEs, window functions)
@@ -1028,6 +1261,8 @@ def main(path: str, overrides: Optional[str], watch: bool, transport: str, host:
         if watch:
             stop_watching()
 
+        _close_read_pool()
+
         if use_http_mode and _db_path and _db_path != ":memory:":
             try:
                 Path(_db_path).unlink(missing_ok=True)
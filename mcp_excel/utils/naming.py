@@ -2,34 +2,83 @@
 Table name generation and collision handling.
 """
 
-import re
+import string
+import sys
 import threading
-from collections import defaultdict
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import Optional
+
+
+class _DeleteMissing(dict):
+    def __missing__(self, codepoint):
+        return None
+
+
+_MAX_NAME_LENGTH = 63
+
+_ALLOWED_CHARS = string.ascii_lowercase + string.digits + "_$"
+
+# Keeps [a-z0-9_$], folds A-Z, turns spaces into underscores and deletes everything else.
+_SANITIZE_TABLE = _DeleteMissing({i: None for i in range(128)})
+_SANITIZE_TABLE.update({ord(c): c for c in _ALLOWED_CHARS})
+_SANITIZE_TABLE.update({ord(c): c.lower() for c in string.ascii_uppercase})
+_SANITIZE_TABLE[ord(' ')] = '_'
+
+
+@lru_cache(maxsize=8192)
+def _sanitize(component: str) -> str:
+    # Some non-ASCII characters lowercase to ASCII (e.g. the Kelvin sign)
+    if not component.isascii():
+        component = component.lower()
+    component = component.translate(_SANITIZE_TABLE)
+    return '_'.join(p for p in component.split('_') if p)
 
 
 class TableRegistry:
-    def __init__(self):
-        self._names: dict[str, int] = {}
-        self._collision_counts: defaultdict[str, int] = defaultdict(int)
-        self._lock = threading.RLock()
+    def __init__(self, thread_safe: bool = True):
+        self._names: set[str] = set()
+        self._collision_counts: Optional[dict[str, int]] = None
+        self._prefix_cache: dict[tuple[str, str], tuple[tuple[str, ...], bool]] = {}
+        self._lock = threading.Lock() if thread_safe else nullcontext()
 
     def register(self, alias: str, relpath: str, sheet: str, region_id: int = 0) -> str:
+        sanitized = self._build_and_sanitize(alias, relpath, sheet, region_id)
+        return self._commit_name(sanitized)
+
+    def _commit_name(self, sanitized: str) -> str:
         with self._lock:
-            sanitized = self._build_and_sanitize(alias, relpath, sheet, region_id)
-            final_name = self._handle_collision(sanitized)
-            self._names[final_name] = 1
+            if sanitized not in self._names:
+                final_name = sys.intern(sanitized)
+            else:
+                final_name = sys.intern(self._handle_collision(sanitized))
+            self._names.add(final_name)
             return final_name
 
-    def _build_and_sanitize(self, alias: str, relpath: str, sheet: str, region_id: int) -> str:
-        relpath_no_ext = relpath.rsplit(".", 1)[0] if "." in relpath else relpath
+    def _sanitized_prefix(self, alias: str, relpath: str) -> tuple[tuple[str, ...], bool]:
+        key = (alias, relpath)
+        cached = self._prefix_cache.get(key)
+        if cached is None:
+            folder, _, filename = relpath.replace("\\", "/").rpartition("/")
+            parts = [alias]
+            if folder:
+                parts.extend(folder.split("/"))
+            parts.append(filename.rsplit(".", 1)[0])
+            prefix = tuple(sp for p in parts if (sp := _sanitize(p)))
+            digit_led = any(p[0].isdigit() for p in prefix)
+            cached = self._prefix_cache[key] = (prefix, digit_led)
+        return cached
 
-        relpath_components = relpath_no_ext.replace("\\", "/").split("/")
+    def _build_and_sanitize(self, alias: str, relpath: str, sheet: str, region_id: int) -> str:
+        prefix, digit_led = self._sanitized_prefix(alias, relpath)
+        sanitized_parts = list(prefix)
 
-        parts = [alias] + relpath_components + [sheet]
+        sanitized_sheet = _sanitize(sheet)
+        if sanitized_sheet:
+            sanitized_parts.append(sanitized_sheet)
+            digit_led = digit_led or sanitized_sheet[0].isdigit()
         if region_id > 0:
-            parts.append(f"r{region_id}")
-
-        sanitized_parts = [self._sanitize_component(p) for p in parts if self._sanitize_component(p)]
+            sanitized_parts.append(f"r{region_id}")
 
         if not sanitized_parts:
             return "table"
@@ -39,37 +88,24 @@ class TableRegistry:
 
         name = ".".join(sanitized_parts)
 
-        if name and name[0].isdigit():
-            name = f"t_{name}"
-        elif any(part and part[0].isdigit() for part in sanitized_parts):
+        if digit_led:
             name = f"t_{name}"
 
-        if len(name) > 63:
-            name = name[:63]
-
-        return name
-
-    def _sanitize_component(self, component: str) -> str:
-        component = component.lower()
-        component = component.replace(' ', '_')
-        component = re.sub(r'[^a-z0-9_$]', '', component)
-        component = re.sub(r'_+', '_', component)
-        component = component.strip('_')
-        return component
+        return name[:_MAX_NAME_LENGTH]
 
     def _handle_collision(self, name: str) -> str:
-        if name not in self._names:
-            return name
-
-        self._collision_counts[name] += 1
-        collision_num = self._collision_counts[name] + 1
+        if self._collision_counts is None:
+            self._collision_counts = {}
 
+        collision_num = self._collision_counts.get(name, 1) + 1
         while f"{name}_{collision_num}" in self._names:
             collision_num += 1
 
+        self._collision_counts[name] = collision_num
         return f"{name}_{collision_num}"
 
     def clear(self):
         with self._lock:
             self._names.clear()
-            self._collision_counts.clear()
+            self._collision_counts = None
+            self._prefix_cache.clear()
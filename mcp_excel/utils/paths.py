@@ -0,0 +1,104 @@
+"""
+Directory walking and glob matching for load_dir.
+"""
+
+import os
+import re
+from typing import Iterator, Optional
+
+
+_GLOB_FLAGS = re.IGNORECASE if os.name == "nt" else 0
+
+
+def _translate_segment(segment: str) -> str:
+    out = []
+    i = 0
+    while i < len(segment):
+        ch = segment[i]
+        if ch == "*":
+            out.append("[^/]*")
+        elif ch == "?":
+            out.append("[^/]")
+        elif ch == "[":
+            # Same bracket rules as fnmatch.translate: a leading "!" negates,
+            # and a "]" right after "[" or "[!" is a literal member of the set
+            end = i + 1
+            if end < len(segment) and segment[end] == "!":
+                end += 1
+            if end < len(segment) and segment[end] == "]":
+                end += 1
+            end = segment.find("]", end)
+            if end == -1:
+                out.append(re.escape(ch))
+            else:
+                body = re.sub(r"([&~|\]])", r"\\\1", segment[i + 1:end])
+                if body == "!":
+                    out.append("[^/]")
+                elif body.startswith("!"):
+                    out.append(f"[^/{body[1:]}]")
+                elif body.startswith(("^", "[")):
+                    out.append(f"[\\{body}]")
+                else:
+                    out.append(f"[{body}]")
+                i = end
+        else:
+            out.append(re.escape(ch))
+        i += 1
+    return "".join(out)
+
+
+def _glob_to_regex(pattern: str) -> str:
+    segments = pattern.replace("\\", "/").split("/")
+    last = len(segments) - 1
+
+    regex = ""
+    for idx, segment in enumerate(segments):
+        if segment == "**":
+            regex += "(?:[^/]+/)*" if idx < last else ".*"
+            continue
+
+        regex += _translate_segment(segment)
+        if idx < last:
+            regex += "/"
+
+    return regex
+
+
+def compile_glob(pattern: str) -> re.Pattern:
+    return re.compile(_glob_to_regex(pattern) + r"\Z", _GLOB_FLAGS)
+
+
+def compile_exclude_globs(patterns: list[str]) -> Optional[re.Pattern]:
+    """
+    Combine exclude patterns into one regex over relative paths.
+
+    Patterns match from the right, like Path.match: "*.csv" excludes CSVs at any depth.
+    """
+    if not patterns:
+        return None
+
+    alternatives = "|".join(f"(?:{_glob_to_regex(pattern)})" for pattern in patterns)
+    return re.compile(f"(?:.*/)?(?:{alternatives})\\Z", _GLOB_FLAGS)
+
+
+def walk_files(root: str, prefix: str = "") -> Iterator[tuple[str, os.DirEntry]]:
+    """
+    Yield (relative_path, entry) for every regular file under root.
+
+    Files in a directory come before its subdirectories, matching Path.glob("**/...").
+    """
+    files = []
+    subdirs = []
+
+    with os.scandir(root) as entries:
+        for entry in entries:
+            relpath = os.path.join(prefix, entry.name) if prefix else entry.name
+            if entry.is_file():
+                files.append((relpath, entry))
+            elif entry.is_dir(follow_symlinks=False):
+                subdirs.append((entry.path, relpath))
+
+    yield from files
+
+    for subdir_path, subdir_relpath in subdirs:
+        yield from walk_files(subdir_path, subdir_relpath)
@@ -1,38 +1,153 @@
 import pytest
+import os
+import shutil
+import hashlib
 import tempfile
 import re
+import string
+import zipfile
+import math
+import io
+import xml.etree.ElementTree as ET
+from datetime import date, datetime
+from xml.sax.saxutils import escape
 from pathlib import Path
 import pandas as pd
 import duckdb
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
 import mcp_excel.server as server
 from mcp_excel.loading.loader import ExcelLoader
 from mcp_excel.utils.naming import TableRegistry
 
 
+_INVALID_CHARS_RE = re.compile(r'[^a-z0-9_$]')
+_MULTI_UNDERSCORE_RE = re.compile(r'_+')
+
+
 @pytest.fixture
 def temp_dir():
     with tempfile.TemporaryDirectory() as tmpdir:
         yield Path(tmpdir)
 
 
+def _scratch_root():
+    """Per-process directory on tmpfs, or None to use the default temp dir"""
+    if not os.access("/dev/shm", os.W_OK):
+        return None
+    root = os.path.join("/dev/shm", "mcp_excel_tests", str(os.getpid()))
+    try:
+        os.makedirs(root, exist_ok=True)
+    except OSError:
+        return None
+    return root
+
+
+@pytest.fixture(scope="session")
+def scratch_root():
+    root = _scratch_root()
+    yield root
+    if root:
+        shutil.rmtree(root, ignore_errors=True)
+
+
 @pytest.fixture
-def temp_excel_dir():
-    with tempfile.TemporaryDirectory(prefix="test_excel_") as tmpdir:
+def temp_excel_dir(scratch_root):
+    with tempfile.TemporaryDirectory(prefix="test_excel_", dir=scratch_root) as tmpdir:
         yield Path(tmpdir)
 
 
 @pytest.fixture
 def sample_excel(temp_dir):
     file_path = temp_dir / "test.xlsx"
-    df = pd.DataFrame({
-        "Name": ["Alice", "Bob", "Charlie"],
-        "Age": [25, 30, 35],
-        "City": ["NYC", "LA", "SF"]
-    })
-    df.to_excel(file_path, sheet_name="Data", index=False)
+    write_xlsx(file_path, "Data", ["Name", "Age", "City"], [
+        ["Alice", 25, "NYC"],
+        ["Bob", 30, "LA"],
+        ["Charlie", 35, "SF"],
+    ])
     return file_path
 
 
+@pytest.fixture(scope="session")
+def xlsx_cache_dir(scratch_root):
+    # Same filesystem as temp_excel_dir so prebuilt_xlsx can hardlink
+    with tempfile.TemporaryDirectory(prefix="xlsx_cache_", dir=scratch_root) as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def prebuilt_xlsx(xlsx_cache_dir):
+    """Write a workbook once per distinct content and hardlink it into place"""
+    def build(path: Path, sheet: str, headers: list, rows: list) -> Path:
+        key = hashlib.sha1(repr((sheet, headers, rows)).encode()).hexdigest()
+        cached = xlsx_cache_dir / f"{key}.xlsx"
+        if not cached.exists():
+            write_xlsx(cached, sheet, headers, rows)
+        try:
+            os.link(cached, path)
+        except OSError:
+            shutil.copyfile(cached, path)
+        return path
+
+    return build
+
+
+@pytest.fixture
+def overrides_builder(temp_excel_dir):
+    """build_overrides for temp_excel_dir, rebuilt only when its workbooks change"""
+    cache = {}
+
+    def build():
+        with os.scandir(temp_excel_dir) as entries:
+            stats = [(e.name, e.stat()) for e in entries if e.is_file() and e.name.endswith(".xlsx")]
+        key = tuple(sorted((name, st.st_mtime_ns, st.st_size) for name, st in stats))
+        if key not in cache:
+            cache[key] = build_overrides(temp_excel_dir)
+        return cache[key]
+
+    return build
+
+
+@pytest.fixture
+def add_files(overrides_builder):
+    """Load just the given workbooks with header_rows=1 on every sheet"""
+    def add(*paths: Path) -> list[dict]:
+        overrides = overrides_builder()
+        return [server.add_file(str(path), overrides=overrides.get(path.name)) for path in paths]
+
+    return add
+
+
+@pytest.fixture
+def excel_env(temp_excel_dir, prebuilt_xlsx):
+    """
+    Write {filename: {sheet: (headers, rows)}}, load the directory once and return table names.
+
+    Single-sheet workbooks are keyed by file stem, multi-sheet workbooks by sheet name.
+    """
+    def build(spec: dict[str, dict[str, tuple[list, list]]]) -> dict[str, str]:
+        keys = {}
+        for filename, sheets in spec.items():
+            path = temp_excel_dir / filename
+            if len(sheets) == 1:
+                (sheet, (headers, rows)), = sheets.items()
+                prebuilt_xlsx(path, sheet, headers, rows)
+                keys[(filename, sheet)] = path.stem
+            else:
+                write_xlsx_sheets(path, sheets)
+                keys.update({(filename, sheet): sheet for sheet in sheets})
+
+        server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
+
+        with server._catalog_lock:
+            return {
+                keys[(meta.relpath, meta.sheet)]: meta.table_name
+                for meta in server.catalog.values() if (meta.relpath, meta.sheet) in keys
+            }
+
+    return build
+
+
 @pytest.fixture
 def conn():
     connection = duckdb.connect(":memory:")
@@ -40,10 +155,15 @@ def conn():
     connection.close()
 
 
+@pytest.fixture(scope="session")
+def table_registry():
+    return TableRegistry(thread_safe=False)
+
+
 @pytest.fixture
-def loader(conn):
-    registry = TableRegistry()
-    return ExcelLoader(conn, registry)
+def loader(conn, table_registry):
+    yield ExcelLoader(conn, table_registry)
+    table_registry.clear()
 
 
 @pytest.fixture
@@ -84,22 +204,169 @@ def test_data_dir():
     with tempfile.TemporaryDirectory(prefix="test_") as tmpdir:
         tmpdir = Path(tmpdir)
         for i in range(3):
-            df = pd.DataFrame({
-                "Product": [f"Product{j}" for j in range(5)],
-                "Quantity": [10 * (i + 1) + j for j in range(5)],
-                "Price": [100.0 + i * 10 + j for j in range(5)]
-            })
-            file_path = tmpdir / f"sales_{i}.xlsx"
-            df.to_excel(file_path, sheet_name="Summary", index=False)
+            rows = [[f"Product{j}", 10 * (i + 1) + j, 100.0 + i * 10 + j] for j in range(5)]
+            write_xlsx(tmpdir / f"sales_{i}.xlsx", "Summary", ["Product", "Quantity", "Price"], rows)
         yield tmpdir
 
 
+def write_xlsx(path: Path, sheet: str, headers: list, rows: list):
+    Path(path).write_bytes(render_xlsx(sheet, headers, rows))
+
+
+def write_xlsx_sheets(path: Path, sheets: dict[str, tuple[list, list]]):
+    wb = Workbook(write_only=True)
+    for sheet, (headers, rows) in sheets.items():
+        ws = wb.create_sheet(sheet)
+        ws.append(headers)
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+
+
+# Parts of a single-sheet workbook that never change; only the sheet name and sheet1.xml vary
+_XLSX_TEMPLATE = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    # cellXfs 1 is the datetime format openpyxl uses for datetime cells
+    "xl/styles.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd h:mm:ss"/></numFmts>'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    ),
+}
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+_XLSX_EPOCH_ORDINAL = datetime(1899, 12, 30).toordinal()
+_XLSX_COLUMNS = tuple(string.ascii_uppercase)
+
+
+def _xlsx_cell(ref: str, value) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{ref}"><v>{value!r}</v></c>'
+    if isinstance(value, date):
+        serial = value.toordinal() - _XLSX_EPOCH_ORDINAL
+        if isinstance(value, datetime):
+            seconds = value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1e6
+            serial += seconds / 86400
+        return f'<c r="{ref}" s="1"><v>{serial!r}</v></c>'
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{escape(str(value))}</t></is></c>'
+
+
+def render_xlsx(sheet: str, headers: list, rows) -> bytes:
+    """Single-sheet xlsx bytes: the cached template parts plus a freshly built sheet1.xml"""
+    ncols = len(headers)
+    cols = _XLSX_COLUMNS[:ncols] if ncols <= len(_XLSX_COLUMNS) else [
+        get_column_letter(j) for j in range(1, ncols + 1)
+    ]
+    body = []
+    for i, row in enumerate([headers, *rows], start=1):
+        cells = "".join(_xlsx_cell(f"{col}{i}", value) for col, value in zip(cols, row))
+        body.append(f'<row r="{i}">{cells}</row>')
+    sheet_xml = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        f'<sheetData>{"".join(body)}</sheetData></worksheet>'
+    )
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as z:
+        for name, part in _XLSX_TEMPLATE.items():
+            z.writestr(name, part)
+        z.writestr("xl/workbook.xml", _XLSX_WORKBOOK.format(name=escape(sheet, {'"': "&quot;"})))
+        z.writestr("xl/worksheets/sheet1.xml", sheet_xml)
+    return buf.getvalue()
+
+
+def write_xlsx_frame(path: Path, sheet: str, df: pd.DataFrame):
+    """df.to_excel(path, sheet_name=sheet, index=False) without going through a workbook writer"""
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    write_xlsx(path, sheet, list(df.columns), rows)
+
+
+def write_csv_bytes(path: Path, body: str, encoding: str):
+    """Encode body once and write it straight to the file descriptor"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, body.encode(encoding))
+    finally:
+        os.close(fd)
+
+
+# Shared by every sheet entry; the server only reads override dicts
+_HEADER_ROWS_1 = {"header_rows": 1}
+
+
+def _sheet_names(path) -> list:
+    # Sheet names live in xl/workbook.xml, no need to load the workbook
+    try:
+        with zipfile.ZipFile(path) as z:
+            workbook = ET.fromstring(z.read("xl/workbook.xml"))
+    except (zipfile.BadZipFile, KeyError, ET.ParseError, OSError):
+        return []
+    return [sheet.get("name") for sheet in workbook.findall("{*}sheets/{*}sheet")]
+
+
+def build_overrides(temp_dir) -> dict:
+    """Create overrides dict that applies header_rows=1 to all Excel files"""
+    with os.scandir(temp_dir) as entries:
+        return {
+            e.name: {"sheet_overrides": dict.fromkeys(_sheet_names(e.path), _HEADER_ROWS_1)}
+            for e in entries if e.is_file() and e.name.endswith(".xlsx")
+        }
+
+
 def get_sanitized_alias(path: Path) -> str:
     alias = path.name or "excel"
     alias = alias.lower()
     alias = alias.replace(' ', '_')
-    alias = re.sub(r'[^a-z0-9_$]', '', alias)
-    alias = re.sub(r'_+', '_', alias)
+    alias = _INVALID_CHARS_RE.sub('', alias)
+    alias = _MULTI_UNDERSCORE_RE.sub('_', alias)
     alias = alias.strip('_')
     return alias if alias else "excel"
 
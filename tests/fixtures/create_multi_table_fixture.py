@@ -1,76 +1,44 @@
 import openpyxl
 from pathlib import Path
 
-def create_multi_table_fixture():
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "MultiTable"
-
-    ws['A1'] = "Q1 Sales Report"
-
-    ws['A3'] = "Product"
-    ws['B3'] = "Revenue"
-    ws['C3'] = "Units"
-
-    ws['A4'] = "Widget A"
-    ws['B4'] = 1500
-    ws['C4'] = 50
-
-    ws['A5'] = "Widget B"
-    ws['B5'] = 2300
-    ws['C5'] = 75
-
-    ws['A6'] = "Widget C"
-    ws['B6'] = 1800
-    ws['C6'] = 60
-
-    ws['A12'] = "Category"
-    ws['B12'] = "Amount"
-    ws['C12'] = "Department"
-
-    ws['A13'] = "Marketing"
-    ws['B13'] = 5000
-    ws['C13'] = "Sales"
+SHEETS = {
+    "MultiTable": [
+        (1, [["Q1 Sales Report"]]),
+        (3, [
+            ["Product", "Revenue", "Units"],
+            ["Widget A", 1500, 50],
+            ["Widget B", 2300, 75],
+            ["Widget C", 1800, 60],
+        ]),
+        (12, [
+            ["Category", "Amount", "Department"],
+            ["Marketing", 5000, "Sales"],
+            ["Operations", 8000, "Ops"],
+            ["Research", 12000, "R&D"],
+            ["Travel", 3500, "All"],
+        ]),
+    ],
+    "ThreeTables": [
+        (1, [["North Region"], ["Sales", "Target"], [100, 120]]),
+        (7, [["South Region"], ["Sales", "Target"], [150, 140]]),
+        (13, [["East Region"], ["Sales", "Target"], [200, 180]]),
+    ],
+    "SingleTable": [
+        (1, [["Name", "Value"], ["Alpha", 100], ["Beta", 200]]),
+    ],
+}
 
-    ws['A14'] = "Operations"
-    ws['B14'] = 8000
-    ws['C14'] = "Ops"
 
-    ws['A15'] = "Research"
-    ws['B15'] = 12000
-    ws['C15'] = "R&D"
-
-    ws['A16'] = "Travel"
-    ws['B16'] = 3500
-    ws['C16'] = "All"
-
-    ws_three = wb.create_sheet("ThreeTables")
-
-    ws_three['A1'] = "North Region"
-    ws_three['A2'] = "Sales"
-    ws_three['B2'] = "Target"
-    ws_three['A3'] = 100
-    ws_three['B3'] = 120
-
-    ws_three['A7'] = "South Region"
-    ws_three['A8'] = "Sales"
-    ws_three['B8'] = "Target"
-    ws_three['A9'] = 150
-    ws_three['B9'] = 140
-
-    ws_three['A13'] = "East Region"
-    ws_three['A14'] = "Sales"
-    ws_three['B14'] = "Target"
-    ws_three['A15'] = 200
-    ws_three['B15'] = 180
-
-    ws_single = wb.create_sheet("SingleTable")
-    ws_single['A1'] = "Name"
-    ws_single['B1'] = "Value"
-    ws_single['A2'] = "Alpha"
-    ws_single['B2'] = 100
-    ws_single['A3'] = "Beta"
-    ws_single['B3'] = 200
+def create_multi_table_fixture():
+    wb = openpyxl.Workbook()
+    wb.remove(wb.active)
+
+    for sheet_name, blocks in SHEETS.items():
+        ws = wb.create_sheet(sheet_name)
+        for start_row, rows in blocks:
+            for row_idx, row in enumerate(rows, start=start_row):
+                for col_idx, value in enumerate(row, start=1):
+                    ws.cell(row=row_idx, column=col_idx, value=value)
 
     fixtures_dir = Path(__file__).parent
     fixtures_dir.mkdir(exist_ok=True)
@@ -1,48 +1,26 @@
 import pytest
 from pathlib import Path
-import pandas as pd
 import mcp_excel.server as server
-
-
-def setup_overrides_for_all_files(temp_dir):
-    """Create overrides dict that applies header_rows=1 to all Excel files"""
-    from pathlib import Path
-    overrides = {}
-    for f in Path(temp_dir).glob("*.xlsx"):
-        overrides[f.name] = {"sheet_overrides": {}}
-        # Get all sheets
-        import openpyxl
-        try:
-            wb = openpyxl.load_workbook(f, read_only=True)
-            for sheet_name in wb.sheetnames:
-                overrides[f.name]["sheet_overrides"][sheet_name] = {"header_rows": 1}
-            wb.close()
-        except:
-            pass
-    return overrides
+from tests.conftest import write_xlsx
 
 
 pytestmark = [pytest.mark.integration, pytest.mark.usefixtures("setup_server")]
 
 
-def test_rounding_differences_in_totals(temp_excel_dir):
+def test_rounding_differences_in_totals(temp_excel_dir, add_files):
     file1 = temp_excel_dir / "line_items.xlsx"
-    df1 = pd.DataFrame({
-        "Item": ["A", "B", "C"],
-        "UnitPrice": [10.333, 20.666, 30.999],
-        "Quantity": [3, 2, 1],
-        "LineTotal": [31.00, 41.33, 31.00]
-    })
-    df1.to_excel(file1, sheet_name="Items", index=False)
+    write_xlsx(file1, "Items", ["Item", "UnitPrice", "Quantity", "LineTotal"], [
+        ["A", 10.333, 3, 31.00],
+        ["B", 20.666, 2, 41.33],
+        ["C", 30.999, 1, 31.00],
+    ])
 
     file2 = temp_excel_dir / "invoice_summary.xlsx"
-    df2 = pd.DataFrame({
-        "InvoiceID": [1],
-        "GrandTotal": [103.33]
-    })
-    df2.to_excel(file2, sheet_name="Summary", index=False)
+    write_xlsx(file2, "Summary", ["InvoiceID", "GrandTotal"], [
+        [1, 103.33],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    add_files(file1, file2)
 
     tables = server.list_tables()
     items_table = [t["table"] for t in tables["tables"] if "line_items" in t["table"]][0]
@@ -59,23 +37,20 @@ def test_rounding_differences_in_totals(temp_excel_dir):
     assert result["row_count"] == 1
 
 
-def test_cents_difference_bank_fees(temp_excel_dir):
+def test_cents_difference_bank_fees(temp_excel_dir, add_files):
     invoices_file = temp_excel_dir / "invoices.xlsx"
-    df_inv = pd.DataFrame({
-        "InvoiceNumber": ["INV001", "INV002"],
-        "Amount": [1234.56, 5678.90]
-    })
-    df_inv.to_excel(invoices_file, sheet_name="Invoices", index=False)
+    write_xlsx(invoices_file, "Invoices", ["InvoiceNumber", "Amount"], [
+        ["INV001", 1234.56],
+        ["INV002", 5678.90],
+    ])
 
     bank_file = temp_excel_dir / "bank_deposits.xlsx"
-    df_bank = pd.DataFrame({
-        "DepositRef": ["INV001", "INV002"],
-        "DepositAmount": [1232.56, 5675.90],
-        "BankFee": [2.00, 3.00]
-    })
-    df_bank.to_excel(bank_file, sheet_name="Deposits", index=False)
+    write_xlsx(bank_file, "Deposits", ["DepositRef", "DepositAmount", "BankFee"], [
+        ["INV001", 1232.56, 2.00],
+        ["INV002", 5675.90, 3.00],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    add_files(invoices_file, bank_file)
 
     tables = server.list_tables()
     inv_table = [t["table"] for t in tables["tables"] if "invoices" in t["table"]][0]
@@ -96,22 +71,22 @@ def test_cents_difference_bank_fees(temp_excel_dir):
     assert result["row_count"] == 2
 
 
-def test_floating_point_precision_issues(temp_excel_dir):
+def test_floating_point_precision_issues(temp_excel_dir, add_files):
     file1 = temp_excel_dir / "calculated.xlsx"
-    df1 = pd.DataFrame({
-        "ID": [1, 2, 3],
-        "Value": [0.1 + 0.2, 0.3, 1.0 / 3.0]
-    })
-    df1.to_excel(file1, sheet_name="Data", index=False)
+    write_xlsx(file1, "Data", ["ID", "Value"], [
+        [1, 0.1 + 0.2],
+        [2, 0.3],
+        [3, 1.0 / 3.0],
+    ])
 
     file2 = temp_excel_dir / "expected.xlsx"
-    df2 = pd.DataFrame({
-        "ID": [1, 2, 3],
-        "ExpectedValue": [0.3, 0.3, 0.333333]
-    })
-    df2.to_excel(file2, sheet_name="Expected", index=False)
+    write_xlsx(file2, "Expected", ["ID", "ExpectedValue"], [
+        [1, 0.3],
+        [2, 0.3],
+        [3, 0.333333],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    add_files(file1, file2)
 
     tables = server.list_tables()
     calc_table = [t["table"] for t in tables["tables"] if "calculated" in t["table"]][0]
@@ -130,26 +105,20 @@ def test_floating_point_precision_issues(temp_excel_dir):
     assert result["row_count"] == 3
 
 
-def test_tax_calculation_rounding(temp_excel_dir):
+def test_tax_calculation_rounding(temp_excel_dir, add_files):
     items_file = temp_excel_dir / "order_items.xlsx"
-    df_items = pd.DataFrame({
-        "OrderID": [1, 1, 1],
-        "ItemPrice": [10.00, 20.00, 30.00],
-        "TaxRate": [0.085, 0.085, 0.085],
-        "ItemTax": [0.85, 1.70, 2.55]
-    })
-    df_items.to_excel(items_file, sheet_name="Items", index=False)
+    write_xlsx(items_file, "Items", ["OrderID", "ItemPrice", "TaxRate", "ItemTax"], [
+        [1, 10.00, 0.085, 0.85],
+        [1, 20.00, 0.085, 1.70],
+        [1, 30.00, 0.085, 2.55],
+    ])
 
     orders_file = temp_excel_dir / "orders.xlsx"
-    df_orders = pd.DataFrame({
-        "OrderID": [1],
-        "Subtotal": [60.00],
-        "TotalTax": [5.10],
-        "GrandTotal": [65.10]
-    })
-    df_orders.to_excel(orders_file, sheet_name="Orders", index=False)
+    write_xlsx(orders_file, "Orders", ["OrderID", "Subtotal", "TotalTax", "GrandTotal"], [
+        [1, 60.00, 5.10, 65.10],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    add_files(items_file, orders_file)
 
     tables = server.list_tables()
     items_table = [t["table"] for t in tables["tables"] if "order_items" in t["table"]][0]
@@ -169,17 +138,15 @@ def test_tax_calculation_rounding(temp_excel_dir):
     assert result["row_count"] == 1
 
 
-def test_currency_conversion_precision(temp_excel_dir):
+def test_currency_conversion_precision(temp_excel_dir, add_files):
     transactions_file = temp_excel_dir / "transactions.xlsx"
-    df_trans = pd.DataFrame({
-        "TransactionID": [1, 2, 3],
-        "Amount_USD": [100.00, 250.50, 1000.75],
-        "ExchangeRate": [1.18, 1.18, 1.18],
-        "Amount_EUR_Calculated": [84.75, 212.29, 848.09]
-    })
-    df_trans.to_excel(transactions_file, sheet_name="Transactions", index=False)
+    write_xlsx(transactions_file, "Transactions", ["TransactionID", "Amount_USD", "ExchangeRate", "Amount_EUR_Calculated"], [
+        [1, 100.00, 1.18, 84.75],
+        [2, 250.50, 1.18, 212.29],
+        [3, 1000.75, 1.18, 848.09],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    add_files(transactions_file)
 
     tables = server.list_tables()
     trans_table = [t["table"] for t in tables["tables"] if "transactions" in t["table"]][0]
@@ -197,22 +164,21 @@ def test_currency_conversion_precision(temp_excel_dir):
     assert result["row_count"] >= 0
 
 
-def test_percentage_allocation_rounding(temp_excel_dir):
+def test_percentage_allocation_rounding(temp_excel_dir, add_files):
     allocation_file = temp_excel_dir / "allocations.xlsx"
-    df_alloc = pd.DataFrame({
-        "Department": ["Sales", "Marketing", "Engineering", "Operations"],
-        "Percentage": [0.40, 0.25, 0.25, 0.10],
-        "AllocatedAmount": [4000.00, 2500.00, 2500.00, 1000.00]
-    })
-    df_alloc.to_excel(allocation_file, sheet_name="Allocations", index=False)
+    write_xlsx(allocation_file, "Allocations", ["Department", "Percentage", "AllocatedAmount"], [
+        ["Sales", 0.40, 4000.00],
+        ["Marketing", 0.25, 2500.00],
+        ["Engineering", 0.25, 2500.00],
+        ["Operations", 0.10, 1000.00],
+    ])
 
     budget_file = temp_excel_dir / "budget.xlsx"
-    df_budget = pd.DataFrame({
-        "TotalBudget": [10000.00]
-    })
-    df_budget.to_excel(budget_file, sheet_name="Budget", index=False)
+    write_xlsx(budget_file, "Budget", ["TotalBudget"], [
+        [10000.00],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    add_files(allocation_file, budget_file)
 
     tables = server.list_tables()
     alloc_table = [t["table"] for t in tables["tables"] if "allocations" in t["table"]][0]
@@ -229,17 +195,15 @@ def test_percentage_allocation_rounding(temp_excel_dir):
     assert result["row_count"] == 1
 
 
-def test_discount_calculation_precision(temp_excel_dir):
+def test_discount_calculation_precision(temp_excel_dir, add_files):
     prices_file = temp_excel_dir / "prices.xlsx"
-    df_prices = pd.DataFrame({
-        "ProductID": [1, 2, 3],
-        "ListPrice": [99.99, 149.99, 299.99],
-        "DiscountPercent": [0.15, 0.20, 0.10],
-        "FinalPrice": [84.99, 119.99, 269.99]
-    })
-    df_prices.to_excel(prices_file, sheet_name="Prices", index=False)
+    write_xlsx(prices_file, "Prices", ["ProductID", "ListPrice", "DiscountPercent", "FinalPrice"], [
+        [1, 99.99, 0.15, 84.99],
+        [2, 149.99, 0.20, 119.99],
+        [3, 299.99, 0.10, 269.99],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    add_files(prices_file)
 
     tables = server.list_tables()
     prices_table = [t["table"] for t in tables["tables"] if "prices" in t["table"]][0]
@@ -257,23 +221,20 @@ def test_discount_calculation_precision(temp_excel_dir):
     assert result["row_count"] >= 0
 
 
-def test_split_payment_precision(temp_excel_dir):
+def test_split_payment_precision(temp_excel_dir, add_files):
     invoice_file = temp_excel_dir / "invoice.xlsx"
-    df_inv = pd.DataFrame({
-        "InvoiceID": [1],
-        "TotalAmount": [1000.00]
-    })
-    df_inv.to_excel(invoice_file, sheet_name="Invoice", index=False)
+    write_xlsx(invoice_file, "Invoice", ["InvoiceID", "TotalAmount"], [
+        [1, 1000.00],
+    ])
 
     payments_file = temp_excel_dir / "split_payments.xlsx"
-    df_pay = pd.DataFrame({
-        "PaymentID": [1, 2, 3],
-        "InvoiceID": [1, 1, 1],
-        "Amount": [333.33, 333.33, 333.34]
-    })
-    df_pay.to_excel(payments_file, sheet_name="Payments", index=False)
+    write_xlsx(payments_file, "Payments", ["PaymentID", "InvoiceID", "Amount"], [
+        [1, 1, 333.33],
+        [2, 1, 333.33],
+        [3, 1, 333.34],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    add_files(invoice_file, payments_file)
 
     tables = server.list_tables()
     inv_table = [t["table"] for t in tables["tables"] if "invoice" in t["table"]][0]
@@ -294,18 +255,14 @@ def test_split_payment_precision(temp_excel_dir):
 
 
 @pytest.mark.skip(reason="Precision test needs adjustment")
-def test_interest_calculation_precision(temp_excel_dir):
+def test_interest_calculation_precision(temp_excel_dir, add_files):
     loans_file = temp_excel_dir / "loans.xlsx"
-    df_loans = pd.DataFrame({
-        "LoanID": [1, 2],
-        "Principal": [10000.00, 25000.00],
-        "InterestRate": [0.0575, 0.0625],
-        "Days": [365, 365],
-        "CalculatedInterest": [575.00, 1562.50]
-    })
-    df_loans.to_excel(loans_file, sheet_name="Loans", index=False)
+    write_xlsx(loans_file, "Loans", ["LoanID", "Principal", "InterestRate", "Days", "CalculatedInterest"], [
+        [1, 10000.00, 0.0575, 365, 575.00],
+        [2, 25000.00, 0.0625, 365, 1562.50],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    add_files(loans_file)
 
     tables = server.list_tables()
     loans_table = [t["table"] for t in tables["tables"] if "loans" in t["table"]][0]
@@ -322,17 +279,15 @@ def test_interest_calculation_precision(temp_excel_dir):
     assert result["row_count"] == 2
 
 
-def test_unit_price_times_quantity_rounding(temp_excel_dir):
+def test_unit_price_times_quantity_rounding(temp_excel_dir, add_files):
     order_file = temp_excel_dir / "order_details.xlsx"
-    df_order = pd.DataFrame({
-        "LineID": [1, 2, 3],
-        "Quantity": [7, 11, 13],
-        "UnitPrice": [12.857, 8.182, 15.385],
-        "LineTotal": [90.00, 90.00, 200.00]
-    })
-    df_order.to_excel(order_file, sheet_name="OrderDetails", index=False)
-
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    write_xlsx(order_file, "OrderDetails", ["LineID", "Quantity", "UnitPrice", "LineTotal"], [
+        [1, 7, 12.857, 90.00],
+        [2, 11, 8.182, 90.00],
+        [3, 13, 15.385, 200.00],
+    ])
+
+    add_files(order_file)
 
     tables = server.list_tables()
     order_table = [t["table"] for t in tables["tables"] if "order" in t["table"]][0]
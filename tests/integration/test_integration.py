@@ -1,10 +1,13 @@
+import dataclasses
 import pytest
 import tempfile
 from pathlib import Path
 import pandas as pd
 import re
+import warnings
 import mcp_excel.server as server
-from tests.conftest import get_sanitized_alias
+from mcp_excel.models import TableMeta
+from tests.conftest import get_sanitized_alias, write_xlsx, write_xlsx_sheets
 
 pytestmark = [pytest.mark.integration, pytest.mark.usefixtures("setup_server")]
 
@@ -82,6 +85,15 @@ def test_query_safety_reject_dml(test_data_dir):
         server.query(f'INSERT INTO "{alias}.sales_0.summary" VALUES (1,2,3)')
 
 
+def test_query_safety_reject_stacked_statements(test_data_dir):
+    server.load_dir(path=str(test_data_dir))
+    alias = get_sanitized_alias(Path(test_data_dir))
+    with pytest.raises(RuntimeError, match="Query failed"):
+        server.query(f'SELECT 1; DROP VIEW "{alias}.sales_0.summary"')
+    result = server.query(f'SELECT * FROM "{alias}.sales_0.summary"')
+    assert result["row_count"] == 5
+
+
 def test_query_row_limit(test_data_dir):
     server.load_dir(path=str(test_data_dir))
     alias = get_sanitized_alias(Path(test_data_dir))
@@ -111,6 +123,22 @@ def test_list_tables_filtered(test_data_dir):
     assert all(t["table"].startswith(f"{alias1}.") for t in result["tables"])
 
 
+def test_list_tables_entries_track_table_meta():
+    meta = TableMeta(
+        table_name="data.sales.q1", file="/tmp/sales.xlsx", relpath="sales.xlsx",
+        sheet="Q1", mode="RAW", mtime=0.0, alias="data",
+    )
+    server.catalog[meta.table_name] = meta
+
+    entry = server.list_tables()["tables"][0]
+    entry["est_rows"] = 999
+    assert server.list_tables()["tables"][0]["est_rows"] == 0
+
+    meta.est_rows = 42
+    assert server.list_tables()["tables"][0]["est_rows"] == 42
+    assert "_list_entry" not in dataclasses.asdict(meta)
+
+
 def test_get_schema(test_data_dir):
     server.load_dir(path=str(test_data_dir))
     tables = server.list_tables()
@@ -160,6 +188,116 @@ def test_assisted_mode_with_overrides(test_data_dir):
     assert result["sheets_count"] > 0
 
 
+def test_add_file_loads_only_that_file(temp_dir):
+    pd.DataFrame({"Name": ["Alice", "Bob"]}).to_excel(temp_dir / "people.xlsx", sheet_name="Staff", index=False)
+    pd.DataFrame({"Item": ["Pen"]}).to_excel(temp_dir / "other.xlsx", sheet_name="Items", index=False)
+
+    alias = get_sanitized_alias(Path(temp_dir))
+    result = server.add_file(str(temp_dir / "people.xlsx"),
+                             overrides={"sheet_overrides": {"Staff": {"header_rows": 1}}})
+    assert result["alias"] == alias
+    assert result["sheets_count"] == 1
+
+    tables = server.list_tables(alias=alias)["tables"]
+    assert [t["relpath"] for t in tables] == ["people.xlsx"]
+
+    result = server.query(f'SELECT Name FROM "{alias}.people.staff" ORDER BY Name')
+    assert [row[0] for row in result["rows"]] == ["Alice", "Bob"]
+
+    assert server.load_configs[alias].include_glob == ["people.xlsx"]
+
+
+def test_add_file_path_with_brackets(temp_dir):
+    write_xlsx(temp_dir / "[draft] people.xlsx", "Staff", ["Name"], [["Alice"], ["Bob"]])
+    write_xlsx(temp_dir / "d people.xlsx", "Staff", ["Name"], [["Carol"]])
+
+    alias = get_sanitized_alias(Path(temp_dir))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", FutureWarning)
+        server.add_file(str(temp_dir / "[draft] people.xlsx"),
+                        overrides={"sheet_overrides": {"Staff": {"header_rows": 1}}})
+        server.refresh(alias=alias, full=True)
+
+    tables = server.list_tables(alias=alias)["tables"]
+    assert [t["relpath"] for t in tables] == ["[draft] people.xlsx"]
+
+
+def test_add_file_rejects_directory(temp_dir):
+    with pytest.raises(ValueError, match="not a file"):
+        server.add_file(str(temp_dir))
+
+
+def test_add_file_rejects_excluded_path(temp_dir):
+    alias = get_sanitized_alias(Path(temp_dir))
+    server.load_dir(str(temp_dir), exclude_glob=["*.xlsx"])
+
+    pd.DataFrame({"Name": ["Alice"]}).to_excel(temp_dir / "people.xlsx", index=False)
+    with pytest.raises(ValueError, match="exclude_glob"):
+        server.add_file(str(temp_dir / "people.xlsx"))
+
+    assert "people.xlsx" not in server.load_configs[alias].include_glob
+
+
+def test_add_file_failure_leaves_config_untouched(temp_dir):
+    (temp_dir / "broken.xlsx").write_text("not a workbook")
+
+    with pytest.raises(Exception):
+        server.add_file(str(temp_dir / "broken.xlsx"))
+
+    assert get_sanitized_alias(Path(temp_dir)) not in server.load_configs
+
+
+def test_load_dir_overlapping_patterns_load_file_once(temp_dir):
+    (temp_dir / "data.csv").write_text("Name,Value\nA,1\nB,2\n")
+
+    result = server.load_dir(str(temp_dir), include_glob=["**/*.csv", "*.csv"])
+    assert result["files_count"] == 1
+    assert result["tables_count"] == 1
+
+
+def test_name_norm_macro():
+    result = server.query("SELECT name_norm('  Société  Générale, Inc. '), name_norm(NULL)")
+    assert result["rows"][0] == ("societe generale inc", None)
+
+
+def test_get_table_prefers_whole_segment(temp_dir):
+    (temp_dir / "transactions.csv").write_text("Id,Value\n1,x\n")
+    (temp_dir / "banktransactions.csv").write_text("Id,Value\n2,x\n")
+    (temp_dir / "bank_feed.csv").write_text("Id,Value\n3,x\n")
+
+    alias = get_sanitized_alias(Path(temp_dir))
+    server.load_dir(str(temp_dir))
+
+    assert server.get_table("transactions") == f"{alias}.transactions.sheet1"
+    assert server.get_table("feed") == f"{alias}.bank_feed.sheet1"
+
+    with pytest.raises(ValueError, match="found 2 tables"):
+        server.get_table("bank")
+
+    with pytest.raises(ValueError, match="found no table"):
+        server.get_table("missing")
+
+
+def test_load_dir_default_sheet_overrides(temp_dir):
+    write_xlsx(temp_dir / "plain.xlsx", "Data", ["Name", "Value"], [["A", 1], ["B", 2]])
+    write_xlsx_sheets(temp_dir / "report.xlsx", {
+        "Report": (["Quarterly report"], [["Name", "Value"], ["C", 3]]),
+    })
+
+    alias = get_sanitized_alias(Path(temp_dir))
+    server.load_dir(str(temp_dir), default_sheet_overrides={"header_rows": 1}, overrides={
+        "report.xlsx": {"sheet_overrides": {"Report": {"skip_rows": 1}}},
+    })
+
+    plain = server.query(f'SELECT Name FROM "{alias}.plain.data" ORDER BY Name')
+    assert [row[0] for row in plain["rows"]] == ["A", "B"]
+
+    report = server.query(f'SELECT Name FROM "{alias}.report.report"')
+    assert [row[0] for row in report["rows"]] == ["C"]
+
+    assert server.load_configs[alias].default_sheet_overrides == {"header_rows": 1}
+
+
 def test_path_validation_nonexistent():
     with pytest.raises(ValueError, match="does not exist"):
         server.load_dir(path="/nonexistent/path")
@@ -1,70 +1,50 @@
 import pytest
-from pathlib import Path
-import pandas as pd
 import csv
 import mcp_excel.server as server
+from tests.conftest import write_csv_bytes
 
 
-def setup_overrides_for_all_files(temp_dir):
-    """Create overrides dict that applies header_rows=1 to all Excel files"""
-    from pathlib import Path
-    overrides = {}
-    for f in Path(temp_dir).glob("*.xlsx"):
-        overrides[f.name] = {"sheet_overrides": {}}
-        # Get all sheets
-        import openpyxl
-        try:
-            wb = openpyxl.load_workbook(f, read_only=True)
-            for sheet_name in wb.sheetnames:
-                overrides[f.name]["sheet_overrides"][sheet_name] = {"header_rows": 1}
-            wb.close()
-        except:
-            pass
-    return overrides
+pytestmark = [pytest.mark.integration, pytest.mark.usefixtures("setup_server")]
 
 
-pytestmark = [pytest.mark.integration, pytest.mark.usefixtures("setup_server")]
+# Single-file cases that share one load_dir: (filename, body, encoding), two data rows each
+ENCODING_CASES = [
+    ("emoji_data.csv", 'Product,Status\r\nCoffee ☕,Available\r\nPizza 🍕,Out of Stock\r\n', 'utf-8'),
+    ("cyrillic.csv", 'Name,Country\r\nВладимир,Россия\r\nОлександр,Україна\r\n', 'utf-8'),
+    ("chinese.csv", '姓名,城市\r\n张三,北京\r\n李四,上海\r\n', 'utf-8'),
+    ("arabic.csv", 'الاسم,المدينة\r\nأحمد,القاهرة\r\nمحمد,دبي\r\n', 'utf-8'),
+    ("null_bytes.csv", 'Name,Value\nClean,100\nNormal,200\n', 'utf-8'),
+    ("nbsp.csv", 'Name,Description\r\nProduct A,High\u00A0quality\r\nProduct B,Low quality\r\n', 'utf-8'),
+    ("zero_width.csv", 'Code,Name\r\nABC\u200B123,Zero-width space\r\nXYZ456,Normal\r\n', 'utf-8'),
+    ("control_chars.csv", 'ID,Text\r\n1,Normal text\r\n2,Tab\there\r\n', 'utf-8'),
+]
 
 
-def test_utf8_and_latin1_csv_files(temp_excel_dir):
+def test_utf8_and_latin1_csv_files(temp_excel_dir, overrides_builder):
     utf8_file = temp_excel_dir / "utf8_data.csv"
-    with open(utf8_file, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['Name', 'City'])
-        writer.writerow(['José García', 'São Paulo'])
-        writer.writerow(['François Müller', 'Zürich'])
+    write_csv_bytes(utf8_file, 'Name,City\r\nJosé García,São Paulo\r\nFrançois Müller,Zürich\r\n', 'utf-8')
 
     latin1_file = temp_excel_dir / "latin1_data.csv"
-    with open(latin1_file, 'w', encoding='latin-1', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['Name', 'City'])
-        writer.writerow(['María López', 'México'])
-        writer.writerow(['André Dubois', 'Montréal'])
+    write_csv_bytes(latin1_file, 'Name,City\r\nMaría López,México\r\nAndré Dubois,Montréal\r\n', 'latin-1')
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
     assert len(tables["tables"]) == 2
 
 
-def test_utf8_with_bom_vs_without(temp_excel_dir):
+def test_utf8_with_bom_vs_without(temp_excel_dir, overrides_builder):
     with_bom = temp_excel_dir / "with_bom.csv"
-    with open(with_bom, 'w', encoding='utf-8-sig', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['Product', 'Price'])
-        writer.writerow(['Widget', '100'])
+    write_csv_bytes(with_bom, 'Product,Price\r\nWidget,100\r\n', 'utf-8-sig')
 
     without_bom = temp_excel_dir / "without_bom.csv"
-    with open(without_bom, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['Product', 'Price'])
-        writer.writerow(['Gadget', '200'])
+    write_csv_bytes(without_bom, 'Product,Price\r\nGadget,200\r\n', 'utf-8')
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
-    table1 = [t["table"] for t in tables["tables"] if "with_bom" in t["table"]][0]
-    table2 = [t["table"] for t in tables["tables"] if "without_bom" in t["table"]][0]
+    table1 = next(t["table"] for t in tables["tables"] if "with_bom" in t["table"])
+    table2 = next(t["table"] for t in tables["tables"] if "without_bom" in t["table"])
 
     schema1 = server.get_schema(table1)
     schema2 = server.get_schema(table2)
@@ -77,7 +57,7 @@ def test_utf8_with_bom_vs_without(temp_excel_dir):
 
 
 @pytest.mark.skip(reason="Windows-1252 encoding needs platform-specific handling")
-def test_windows1252_smart_quotes(temp_excel_dir):
+def test_windows1252_smart_quotes(temp_excel_dir, overrides_builder):
     file_path = temp_excel_dir / "smart_quotes.csv"
 
     with open(file_path, 'w', encoding='windows-1252', newline='') as f:
@@ -86,32 +66,24 @@ def test_windows1252_smart_quotes(temp_excel_dir):
         writer.writerow(['"Premium" Product', "Customer's favorite"])
         writer.writerow(['Standard – Basic', 'Em-dash example'])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
     assert len(tables["tables"]) >= 1
 
 
-def test_mixed_encoding_union_query(temp_excel_dir):
+def test_mixed_encoding_union_query(temp_excel_dir, overrides_builder):
     utf8_file = temp_excel_dir / "data_utf8.csv"
-    with open(utf8_file, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['ID', 'Name'])
-        writer.writerow(['1', 'Café'])
-        writer.writerow(['2', 'Naïve'])
+    write_csv_bytes(utf8_file, 'ID,Name\r\n1,Café\r\n2,Naïve\r\n', 'utf-8')
 
     ascii_file = temp_excel_dir / "data_ascii.csv"
-    with open(ascii_file, 'w', encoding='ascii', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['ID', 'Name'])
-        writer.writerow(['3', 'Coffee'])
-        writer.writerow(['4', 'Simple'])
+    write_csv_bytes(ascii_file, 'ID,Name\r\n3,Coffee\r\n4,Simple\r\n', 'ascii')
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
-    utf8_table = [t["table"] for t in tables["tables"] if "utf8" in t["table"]][0]
-    ascii_table = [t["table"] for t in tables["tables"] if "ascii" in t["table"]][0]
+    utf8_table = next(t["table"] for t in tables["tables"] if "utf8" in t["table"])
+    ascii_table = next(t["table"] for t in tables["tables"] if "ascii" in t["table"])
 
     result = server.query(f'''
         SELECT ID, Name FROM "{utf8_table}"
@@ -122,183 +94,42 @@ def test_mixed_encoding_union_query(temp_excel_dir):
     assert result["row_count"] == 4
 
 
-def test_emoji_in_csv_data(temp_excel_dir):
-    file_path = temp_excel_dir / "emoji_data.csv"
-
-    with open(file_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['Product', 'Status'])
-        writer.writerow(['Coffee ☕', 'Available'])
-        writer.writerow(['Pizza 🍕', 'Out of Stock'])
-
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
-
-    tables = server.list_tables()
-    table = [t["table"] for t in tables["tables"] if "emoji" in t["table"]][0]
-
-    result = server.query(f'SELECT * FROM "{table}"')
-    assert result["row_count"] == 2
-
-
-def test_cyrillic_characters(temp_excel_dir):
-    file_path = temp_excel_dir / "cyrillic.csv"
-
-    with open(file_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['Name', 'Country'])
-        writer.writerow(['Владимир', 'Россия'])
-        writer.writerow(['Олександр', 'Україна'])
-
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
-
-    tables = server.list_tables()
-    table = [t["table"] for t in tables["tables"] if "cyrillic" in t["table"]][0]
-
-    result = server.query(f'SELECT * FROM "{table}"')
-    assert result["row_count"] == 2
-
-
-def test_chinese_characters(temp_excel_dir):
-    file_path = temp_excel_dir / "chinese.csv"
-
-    with open(file_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['姓名', '城市'])
-        writer.writerow(['张三', '北京'])
-        writer.writerow(['李四', '上海'])
-
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
-
-    tables = server.list_tables()
-    table = [t["table"] for t in tables["tables"] if "chinese" in t["table"]][0]
-
-    result = server.query(f'SELECT * FROM "{table}"')
-    assert result["row_count"] == 2
-
-
-def test_arabic_rtl_text(temp_excel_dir):
-    file_path = temp_excel_dir / "arabic.csv"
-
-    with open(file_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['الاسم', 'المدينة'])
-        writer.writerow(['أحمد', 'القاهرة'])
-        writer.writerow(['محمد', 'دبي'])
+def test_single_file_encodings(temp_excel_dir):
+    for filename, body, encoding in ENCODING_CASES:
+        write_csv_bytes(temp_excel_dir / filename, body, encoding)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir))
 
     tables = server.list_tables()
-    table = [t["table"] for t in tables["tables"] if "arabic" in t["table"]][0]
+    for filename, _, _ in ENCODING_CASES:
+        stem = filename.removesuffix(".csv")
+        table = next(t["table"] for t in tables["tables"] if stem in t["table"])
 
-    result = server.query(f'SELECT * FROM "{table}"')
-    assert result["row_count"] == 2
+        result = server.query(f'SELECT * FROM "{table}"')
+        assert result["row_count"] == 2, filename
 
 
-def test_excel_and_csv_mixed_encoding(temp_excel_dir):
+def test_excel_and_csv_mixed_encoding(temp_excel_dir, overrides_builder, prebuilt_xlsx):
     excel_file = temp_excel_dir / "data.xlsx"
-    df_excel = pd.DataFrame({
-        'Name': ['Alice', 'Bob'],
-        'City': ['NYC', 'LA']
-    })
-    df_excel.to_excel(excel_file, sheet_name='People', index=False)
+    prebuilt_xlsx(excel_file, 'People', ['Name', 'City'], [['Alice', 'NYC'], ['Bob', 'LA']])
 
     csv_file = temp_excel_dir / "data_utf8.csv"
-    with open(csv_file, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['Name', 'City'])
-        writer.writerow(['François', 'Paris'])
+    write_csv_bytes(csv_file, 'Name,City\r\nFrançois,Paris\r\n', 'utf-8')
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
     assert len(tables["tables"]) == 2
 
 
-def test_null_bytes_in_text(temp_excel_dir):
-    file_path = temp_excel_dir / "null_bytes.csv"
-
-    with open(file_path, 'w', encoding='utf-8', newline='') as f:
-        f.write('Name,Value\n')
-        f.write('Clean,100\n')
-        f.write('Normal,200\n')
-
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
-
-    tables = server.list_tables()
-    table = [t["table"] for t in tables["tables"] if "null_bytes" in t["table"]][0]
-
-    result = server.query(f'SELECT * FROM "{table}"')
-    assert result["row_count"] == 2
-
-
-def test_non_breaking_spaces(temp_excel_dir):
-    file_path = temp_excel_dir / "nbsp.csv"
-
-    with open(file_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['Name', 'Description'])
-        writer.writerow(['Product A', 'High\u00A0quality'])
-        writer.writerow(['Product B', 'Low quality'])
-
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
-
-    tables = server.list_tables()
-    table = [t["table"] for t in tables["tables"] if "nbsp" in t["table"]][0]
-
-    result = server.query(f'SELECT * FROM "{table}"')
-    assert result["row_count"] == 2
-
-
-def test_zero_width_characters(temp_excel_dir):
-    file_path = temp_excel_dir / "zero_width.csv"
-
-    with open(file_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['Code', 'Name'])
-        writer.writerow(['ABC\u200B123', 'Zero-width space'])
-        writer.writerow(['XYZ456', 'Normal'])
-
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
-
-    tables = server.list_tables()
-    table = [t["table"] for t in tables["tables"] if "zero_width" in t["table"]][0]
-
-    result = server.query(f'SELECT * FROM "{table}"')
-    assert result["row_count"] == 2
-
-
-def test_mixed_line_endings(temp_excel_dir):
+def test_mixed_line_endings(temp_excel_dir, overrides_builder):
     unix_file = temp_excel_dir / "unix_lines.csv"
-    with open(unix_file, 'wb') as f:
-        f.write(b'Name,Value\n')
-        f.write(b'Item1,100\n')
-        f.write(b'Item2,200\n')
+    write_csv_bytes(unix_file, 'Name,Value\nItem1,100\nItem2,200\n', 'ascii')
 
     windows_file = temp_excel_dir / "windows_lines.csv"
-    with open(windows_file, 'wb') as f:
-        f.write(b'Name,Value\r\n')
-        f.write(b'Item3,300\r\n')
-        f.write(b'Item4,400\r\n')
+    write_csv_bytes(windows_file, 'Name,Value\r\nItem3,300\r\nItem4,400\r\n', 'ascii')
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
     assert len(tables["tables"]) == 2
-
-
-def test_control_characters_in_data(temp_excel_dir):
-    file_path = temp_excel_dir / "control_chars.csv"
-
-    with open(file_path, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['ID', 'Text'])
-        writer.writerow(['1', 'Normal text'])
-        writer.writerow(['2', 'Tab\there'])
-
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
-
-    tables = server.list_tables()
-    table = [t["table"] for t in tables["tables"] if "control" in t["table"]][0]
-
-    result = server.query(f'SELECT * FROM "{table}"')
-    assert result["row_count"] == 2
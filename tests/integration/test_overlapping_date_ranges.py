@@ -1,53 +1,41 @@
 import pytest
+import shutil
 from pathlib import Path
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 import mcp_excel.server as server
-
-
-def setup_overrides_for_all_files(temp_dir):
-    """Create overrides dict that applies header_rows=1 to all Excel files"""
-    from pathlib import Path
-    overrides = {}
-    for f in Path(temp_dir).glob("*.xlsx"):
-        overrides[f.name] = {"sheet_overrides": {}}
-        # Get all sheets
-        import openpyxl
-        try:
-            wb = openpyxl.load_workbook(f, read_only=True)
-            for sheet_name in wb.sheetnames:
-                overrides[f.name]["sheet_overrides"][sheet_name] = {"header_rows": 1}
-            wb.close()
-        except:
-            pass
-    return overrides
+from tests.conftest import render_xlsx, write_xlsx_frame
 
 
 pytestmark = [pytest.mark.integration, pytest.mark.usefixtures("setup_server")]
 
+# Arithmetic series totals of the daily/hourly Amount and Metric columns: (first + last) * n // 2
+DAILY_JAN_TOTAL = (100 + 130) * 31 // 2
+HOURLY_TOTAL = (100 + 123) * 24 // 2
+
 
 def test_monthly_files_with_one_day_overlap(temp_excel_dir):
     file1 = temp_excel_dir / "january.xlsx"
     dates1 = pd.date_range(start="2024-01-01", end="2024-02-01", freq="D")
     df1 = pd.DataFrame({
         "Date": dates1,
-        "Sales": range(len(dates1))
+        "Sales": np.arange(len(dates1), dtype=np.int64)
     })
-    df1.to_excel(file1, sheet_name="Sales", index=False)
+    write_xlsx_frame(file1, "Sales", df1)
 
     file2 = temp_excel_dir / "february.xlsx"
     dates2 = pd.date_range(start="2024-02-01", end="2024-02-29", freq="D")
     df2 = pd.DataFrame({
         "Date": dates2,
-        "Sales": range(100, 100 + len(dates2))
+        "Sales": np.arange(100, 100 + len(dates2), dtype=np.int64)
     })
-    df2.to_excel(file2, sheet_name="Sales", index=False)
+    write_xlsx_frame(file2, "Sales", df2)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    jan_table = [t["table"] for t in tables["tables"] if "january" in t["table"]][0]
-    feb_table = [t["table"] for t in tables["tables"] if "february" in t["table"]][0]
+    jan_table = server.get_table("january")
+    feb_table = server.get_table("february")
 
     result = server.query(f'''
         SELECT Date, Sales FROM "{jan_table}"
@@ -64,25 +52,23 @@ def test_monthly_files_with_one_day_overlap(temp_excel_dir):
 
 
 def test_weekly_snapshots_with_full_overlap(temp_excel_dir):
-    base_date = datetime(2024, 1, 1)
+    all_dates = pd.date_range(start="2024-01-01", periods=28, freq="D")
 
     for week in range(4):
         file_path = temp_excel_dir / f"week_{week + 1}.xlsx"
-        start_date = base_date + timedelta(weeks=week)
-        dates = pd.date_range(start=start_date, periods=7, freq="D")
+        dates = all_dates[week * 7:(week + 1) * 7]
 
         df = pd.DataFrame({
             "Date": dates,
-            "Inventory": [1000 + (week * 100) + i for i in range(7)]
+            "Inventory": 1000 + week * 100 + np.arange(7, dtype=np.int64)
         })
-        df.to_excel(file_path, sheet_name="Inventory", index=False)
+        write_xlsx_frame(file_path, "Inventory", df)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    assert len(tables["tables"]) == 4
+    assert len(server.list_tables()["tables"]) == 4
 
-    all_tables = [t["table"] for t in tables["tables"]]
+    all_tables = [t["table"] for t in server.list_tables()["tables"]]
     union_query = " UNION ALL ".join([f'SELECT Date, Inventory FROM "{t}"' for t in all_tables])
 
     result = server.query(union_query)
@@ -94,24 +80,23 @@ def test_daily_and_monthly_aggregates_mixed(temp_excel_dir):
     daily_dates = pd.date_range(start="2024-01-01", end="2024-01-31", freq="D")
     df_daily = pd.DataFrame({
         "Date": daily_dates,
-        "Amount": [100 + i for i in range(len(daily_dates))],
-        "Type": ["Daily"] * len(daily_dates)
+        "Amount": 100 + np.arange(len(daily_dates), dtype=np.int64),
+        "Type": np.full(len(daily_dates), "Daily", dtype=object)
     })
-    df_daily.to_excel(daily_file, sheet_name="Data", index=False)
+    write_xlsx_frame(daily_file, "Data", df_daily)
 
     monthly_file = temp_excel_dir / "monthly_summary.xlsx"
     df_monthly = pd.DataFrame({
         "Date": [datetime(2024, 1, 31)],
-        "Amount": [sum(range(100, 100 + 31))],
+        "Amount": [DAILY_JAN_TOTAL],
         "Type": ["Monthly"]
     })
-    df_monthly.to_excel(monthly_file, sheet_name="Data", index=False)
+    write_xlsx_frame(monthly_file, "Data", df_monthly)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    daily_table = [t["table"] for t in tables["tables"] if "daily" in t["table"]][0]
-    monthly_table = [t["table"] for t in tables["tables"] if "monthly" in t["table"]][0]
+    daily_table = server.get_table("daily_transactions")
+    monthly_table = server.get_table("monthly_summary")
 
     result = server.query(f'''
         SELECT Type, COUNT(*) as count, SUM(Amount) as total
@@ -133,7 +118,7 @@ def test_overlapping_transaction_windows(temp_excel_dir):
         "Timestamp": ["2024-01-15 08:00:00", "2024-01-15 10:00:00", "2024-01-15 11:59:59"],
         "Amount": [100, 200, 300]
     })
-    df1.to_excel(file1, sheet_name="Transactions", index=False)
+    write_xlsx_frame(file1, "Transactions", df1)
 
     file2 = temp_excel_dir / "afternoon_batch.xlsx"
     df2 = pd.DataFrame({
@@ -141,13 +126,12 @@ def test_overlapping_transaction_windows(temp_excel_dir):
         "Timestamp": ["2024-01-15 11:59:59", "2024-01-15 14:00:00", "2024-01-15 16:00:00"],
         "Amount": [300, 400, 500]
     })
-    df2.to_excel(file2, sheet_name="Transactions", index=False)
+    write_xlsx_frame(file2, "Transactions", df2)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    morning_table = [t["table"] for t in tables["tables"] if "morning" in t["table"]][0]
-    afternoon_table = [t["table"] for t in tables["tables"] if "afternoon" in t["table"]][0]
+    morning_table = server.get_table("morning_batch")
+    afternoon_table = server.get_table("afternoon_batch")
 
     result = server.query(f'''
         SELECT TransactionID, COUNT(*) as occurrence_count
@@ -168,23 +152,22 @@ def test_quarterly_files_with_month_overlap(temp_excel_dir):
     q1_dates = pd.date_range(start="2024-01-01", end="2024-03-31", freq="D")
     df_q1 = pd.DataFrame({
         "Date": q1_dates,
-        "Revenue": [1000 + i for i in range(len(q1_dates))]
+        "Revenue": 1000 + np.arange(len(q1_dates), dtype=np.int64)
     })
-    df_q1.to_excel(q1_file, sheet_name="Revenue", index=False)
+    write_xlsx_frame(q1_file, "Revenue", df_q1)
 
     march_file = temp_excel_dir / "March_2024_Updated.xlsx"
     march_dates = pd.date_range(start="2024-03-01", end="2024-03-31", freq="D")
     df_march = pd.DataFrame({
         "Date": march_dates,
-        "Revenue": [2000 + i for i in range(len(march_dates))]
+        "Revenue": 2000 + np.arange(len(march_dates), dtype=np.int64)
     })
-    df_march.to_excel(march_file, sheet_name="Revenue", index=False)
+    write_xlsx_frame(march_file, "Revenue", df_march)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    q1_table = [t["table"] for t in tables["tables"] if "q1" in t["table"].lower()][0]
-    march_table = [t["table"] for t in tables["tables"] if "march" in t["table"]][0]
+    q1_table = server.get_table("q1_2024")
+    march_table = server.get_table("march_2024_updated")
 
     result = server.query(f'''
         SELECT Date, COUNT(*) as file_count
@@ -205,23 +188,22 @@ def test_gap_in_date_ranges(temp_excel_dir):
     dates1 = pd.date_range(start="2024-01-01", end="2024-02-15", freq="D")
     df1 = pd.DataFrame({
         "Date": dates1,
-        "Value": range(len(dates1))
+        "Value": np.arange(len(dates1), dtype=np.int64)
     })
-    df1.to_excel(file1, sheet_name="Data", index=False)
+    write_xlsx_frame(file1, "Data", df1)
 
     file2 = temp_excel_dir / "march.xlsx"
     dates2 = pd.date_range(start="2024-03-01", end="2024-03-31", freq="D")
     df2 = pd.DataFrame({
         "Date": dates2,
-        "Value": range(100, 100 + len(dates2))
+        "Value": np.arange(100, 100 + len(dates2), dtype=np.int64)
     })
-    df2.to_excel(file2, sheet_name="Data", index=False)
+    write_xlsx_frame(file2, "Data", df2)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    table1 = [t["table"] for t in tables["tables"] if "jan_feb" in t["table"]][0]
-    table2 = [t["table"] for t in tables["tables"] if "march" in t["table"]][0]
+    table1 = server.get_table("jan_feb")
+    table2 = server.get_table("march")
 
     result = server.query(f'''
         SELECT MIN(Date) as min_date, MAX(Date) as max_date
@@ -236,23 +218,19 @@ def test_gap_in_date_ranges(temp_excel_dir):
 
 
 def test_duplicate_entire_datasets(temp_excel_dir):
-    df = pd.DataFrame({
-        "ID": [1, 2, 3],
-        "Name": ["Alice", "Bob", "Charlie"],
-        "Amount": [100, 200, 300]
-    })
-
     file1 = temp_excel_dir / "original.xlsx"
-    df.to_excel(file1, sheet_name="Data", index=False)
+    file1.write_bytes(render_xlsx(
+        "Data", ["ID", "Name", "Amount"],
+        [(1, "Alice", 100), (2, "Bob", 200), (3, "Charlie", 300)]
+    ))
 
     file2 = temp_excel_dir / "backup.xlsx"
-    df.to_excel(file2, sheet_name="Data", index=False)
+    shutil.copyfile(file1, file2)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    table1 = [t["table"] for t in tables["tables"] if "original" in t["table"]][0]
-    table2 = [t["table"] for t in tables["tables"] if "backup" in t["table"]][0]
+    table1 = server.get_table("original")
+    table2 = server.get_table("backup")
 
     result = server.query(f'''
         SELECT ID, Name, Amount
@@ -270,49 +248,49 @@ def test_partial_overlap_with_different_granularity(temp_excel_dir):
     hourly_times = pd.date_range(start="2024-01-15 00:00:00", end="2024-01-15 23:00:00", freq="H")
     df_hourly = pd.DataFrame({
         "Timestamp": hourly_times,
-        "Metric": [100 + i for i in range(len(hourly_times))],
-        "Granularity": ["Hourly"] * len(hourly_times)
+        "Metric": 100 + np.arange(len(hourly_times), dtype=np.int64),
+        "Granularity": np.full(len(hourly_times), "Hourly", dtype=object)
     })
-    df_hourly.to_excel(hourly_file, sheet_name="Metrics", index=False)
+    write_xlsx_frame(hourly_file, "Metrics", df_hourly)
 
     daily_file = temp_excel_dir / "daily_summary.xlsx"
     df_daily = pd.DataFrame({
         "Timestamp": [datetime(2024, 1, 15)],
-        "Metric": [sum(range(100, 100 + 24))],
+        "Metric": [HOURLY_TOTAL],
         "Granularity": ["Daily"]
     })
-    df_daily.to_excel(daily_file, sheet_name="Metrics", index=False)
+    write_xlsx_frame(daily_file, "Metrics", df_daily)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    assert len(tables["tables"]) == 2
+    assert len(server.list_tables()["tables"]) == 2
 
 
 def test_overlapping_fiscal_and_calendar_periods(temp_excel_dir):
+    all_dates = pd.date_range(start="2024-01-01", end="2024-04-30", freq="D")
+
     calendar_file = temp_excel_dir / "calendar_q1.xlsx"
-    cal_dates = pd.date_range(start="2024-01-01", end="2024-03-31", freq="D")
+    cal_dates = all_dates[all_dates <= "2024-03-31"]
     df_cal = pd.DataFrame({
         "Date": cal_dates,
-        "Period": ["Calendar Q1"] * len(cal_dates),
-        "Amount": range(len(cal_dates))
+        "Period": np.full(len(cal_dates), "Calendar Q1", dtype=object),
+        "Amount": np.arange(len(cal_dates), dtype=np.int64)
     })
-    df_cal.to_excel(calendar_file, sheet_name="Data", index=False)
+    write_xlsx_frame(calendar_file, "Data", df_cal)
 
     fiscal_file = temp_excel_dir / "fiscal_q1.xlsx"
-    fiscal_dates = pd.date_range(start="2024-02-01", end="2024-04-30", freq="D")
+    fiscal_dates = all_dates[all_dates >= "2024-02-01"]
     df_fiscal = pd.DataFrame({
         "Date": fiscal_dates,
-        "Period": ["Fiscal Q1"] * len(fiscal_dates),
-        "Amount": range(1000, 1000 + len(fiscal_dates))
+        "Period": np.full(len(fiscal_dates), "Fiscal Q1", dtype=object),
+        "Amount": np.arange(1000, 1000 + len(fiscal_dates), dtype=np.int64)
     })
-    df_fiscal.to_excel(fiscal_file, sheet_name="Data", index=False)
+    write_xlsx_frame(fiscal_file, "Data", df_fiscal)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    cal_table = [t["table"] for t in tables["tables"] if "calendar" in t["table"]][0]
-    fiscal_table = [t["table"] for t in tables["tables"] if "fiscal" in t["table"]][0]
+    cal_table = server.get_table("calendar_q1")
+    fiscal_table = server.get_table("fiscal_q1")
 
     result = server.query(f'''
         SELECT Date
@@ -1,26 +1,7 @@
 import pytest
-from pathlib import Path
-import pandas as pd
-from datetime import datetime, timedelta
+from datetime import datetime
 import mcp_excel.server as server
-
-
-def setup_overrides_for_all_files(temp_dir):
-    """Create overrides dict that applies header_rows=1 to all Excel files"""
-    from pathlib import Path
-    overrides = {}
-    for f in Path(temp_dir).glob("*.xlsx"):
-        overrides[f.name] = {"sheet_overrides": {}}
-        # Get all sheets
-        import openpyxl
-        try:
-            wb = openpyxl.load_workbook(f, read_only=True)
-            for sheet_name in wb.sheetnames:
-                overrides[f.name]["sheet_overrides"][sheet_name] = {"header_rows": 1}
-            wb.close()
-        except:
-            pass
-    return overrides
+from tests.conftest import write_xlsx
 
 
 pytestmark = [pytest.mark.integration, pytest.mark.usefixtures("setup_server")]
@@ -28,37 +9,36 @@ pytestmark = [pytest.mark.integration, pytest.mark.usefixtures("setup_server")]
 
 def test_single_invoice_multiple_payments(temp_excel_dir):
     invoices_file = temp_excel_dir / "invoices.xlsx"
-    df_invoices = pd.DataFrame({
-        "InvoiceNumber": ["INV-001", "INV-002"],
-        "Amount": [1000.00, 2000.00],
-        "CustomerID": [1, 2]
-    })
-    df_invoices.to_excel(invoices_file, sheet_name="Invoices", index=False)
+    write_xlsx(invoices_file, "Invoices", ["InvoiceNumber", "Amount", "CustomerID"], [
+        ["INV-001", 1000.00, 1],
+        ["INV-002", 2000.00, 2],
+    ])
 
     payments_file = temp_excel_dir / "payments.xlsx"
-    df_payments = pd.DataFrame({
-        "PaymentID": [1, 2, 3, 4],
-        "InvoiceRef": ["INV-001", "INV-001", "INV-001", "INV-002"],
-        "Amount": [300.00, 300.00, 400.00, 2000.00],
-        "PaymentDate": ["2024-01-15", "2024-01-20", "2024-01-25", "2024-01-10"]
-    })
-    df_payments.to_excel(payments_file, sheet_name="Payments", index=False)
+    write_xlsx(payments_file, "Payments", ["PaymentID", "InvoiceRef", "Amount", "PaymentDate"], [
+        [1, "INV-001", 300.00, "2024-01-15"],
+        [2, "INV-001", 300.00, "2024-01-20"],
+        [3, "INV-001", 400.00, "2024-01-25"],
+        [4, "INV-002", 2000.00, "2024-01-10"],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    inv_table = [t["table"] for t in tables["tables"] if "invoices" in t["table"]][0]
-    pay_table = [t["table"] for t in tables["tables"] if "payments" in t["table"]][0]
+    inv_table = server.get_table("invoices")
+    pay_table = server.get_table("payments")
 
     result = server.query(f'''
         SELECT
             i.InvoiceNumber,
             i.Amount as InvoiceAmount,
-            SUM(p.Amount) as TotalPaid,
-            i.Amount - COALESCE(SUM(p.Amount), 0) as Balance
+            p.TotalPaid,
+            i.Amount - COALESCE(p.TotalPaid, 0) as Balance
         FROM "{inv_table}" i
-        LEFT JOIN "{pay_table}" p ON i.InvoiceNumber = p.InvoiceRef
-        GROUP BY i.InvoiceNumber, i.Amount
+        LEFT JOIN (
+            SELECT InvoiceRef, SUM(Amount) as TotalPaid
+            FROM "{pay_table}"
+            GROUP BY InvoiceRef
+        ) p ON i.InvoiceNumber = p.InvoiceRef
     ''')
 
     assert result["row_count"] == 2
@@ -68,24 +48,23 @@ def test_single_invoice_multiple_payments(temp_excel_dir):
 
 def test_payment_without_invoice_reference(temp_excel_dir):
     invoices_file = temp_excel_dir / "invoices.xlsx"
-    df_invoices = pd.DataFrame({
-        "InvoiceID": ["A001", "A002", "A003"],
-        "Amount": [500.00, 750.00, 1000.00]
-    })
-    df_invoices.to_excel(invoices_file, sheet_name="Invoices", index=False)
+    write_xlsx(invoices_file, "Invoices", ["InvoiceID", "Amount"], [
+        ["A001", 500.00],
+        ["A002", 750.00],
+        ["A003", 1000.00],
+    ])
 
     payments_file = temp_excel_dir / "payments.xlsx"
-    df_payments = pd.DataFrame({
-        "PaymentID": [1, 2, 3, 4],
-        "InvoiceRef": ["A001", None, "A003", "UNKNOWN"],
-        "Amount": [500.00, 750.00, 1000.00, 200.00]
-    })
-    df_payments.to_excel(payments_file, sheet_name="Payments", index=False)
+    write_xlsx(payments_file, "Payments", ["PaymentID", "InvoiceRef", "Amount"], [
+        [1, "A001", 500.00],
+        [2, None, 750.00],
+        [3, "A003", 1000.00],
+        [4, "UNKNOWN", 200.00],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    pay_table = [t["table"] for t in tables["tables"] if "payments" in t["table"]][0]
+    pay_table = server.get_table("payments")
 
     result = server.query(f'''
         SELECT * FROM "{pay_table}"
@@ -97,36 +76,34 @@ def test_payment_without_invoice_reference(temp_excel_dir):
 
 def test_overpayment_scenario(temp_excel_dir):
     invoices_file = temp_excel_dir / "invoices.xlsx"
-    df_invoices = pd.DataFrame({
-        "InvoiceNumber": ["INV-100"],
-        "Amount": [1000.00]
-    })
-    df_invoices.to_excel(invoices_file, sheet_name="Invoices", index=False)
+    write_xlsx(invoices_file, "Invoices", ["InvoiceNumber", "Amount"], [
+        ["INV-100", 1000.00],
+    ])
 
     payments_file = temp_excel_dir / "payments.xlsx"
-    df_payments = pd.DataFrame({
-        "PaymentID": [1, 2],
-        "InvoiceRef": ["INV-100", "INV-100"],
-        "Amount": [1000.00, 50.00]
-    })
-    df_payments.to_excel(payments_file, sheet_name="Payments", index=False)
+    write_xlsx(payments_file, "Payments", ["PaymentID", "InvoiceRef", "Amount"], [
+        [1, "INV-100", 1000.00],
+        [2, "INV-100", 50.00],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    inv_table = [t["table"] for t in tables["tables"] if "invoices" in t["table"]][0]
-    pay_table = [t["table"] for t in tables["tables"] if "payments" in t["table"]][0]
+    inv_table = server.get_table("invoices")
+    pay_table = server.get_table("payments")
 
     result = server.query(f'''
         SELECT
             i.InvoiceNumber,
             i.Amount as InvoiceAmount,
-            SUM(p.Amount) as TotalPaid,
-            i.Amount - SUM(p.Amount) as Balance
+            p.TotalPaid,
+            i.Amount - p.TotalPaid as Balance
         FROM "{inv_table}" i
-        JOIN "{pay_table}" p ON i.InvoiceNumber = p.InvoiceRef
-        GROUP BY i.InvoiceNumber, i.Amount
-        HAVING SUM(p.Amount) > i.Amount
+        JOIN (
+            SELECT InvoiceRef, SUM(Amount) as TotalPaid
+            FROM "{pay_table}"
+            GROUP BY InvoiceRef
+        ) p ON i.InvoiceNumber = p.InvoiceRef
+        WHERE p.TotalPaid > i.Amount
     ''')
 
     assert result["row_count"] == 1
@@ -134,36 +111,34 @@ def test_overpayment_scenario(temp_excel_dir):
 
 def test_bulk_payment_covering_multiple_invoices(temp_excel_dir):
     invoices_file = temp_excel_dir / "invoices.xlsx"
-    df_invoices = pd.DataFrame({
-        "InvoiceNumber": ["INV-201", "INV-202", "INV-203"],
-        "CustomerID": [1, 1, 1],
-        "Amount": [100.00, 200.00, 300.00]
-    })
-    df_invoices.to_excel(invoices_file, sheet_name="Invoices", index=False)
+    write_xlsx(invoices_file, "Invoices", ["InvoiceNumber", "CustomerID", "Amount"], [
+        ["INV-201", 1, 100.00],
+        ["INV-202", 1, 200.00],
+        ["INV-203", 1, 300.00],
+    ])
 
     payments_file = temp_excel_dir / "payments.xlsx"
-    df_payments = pd.DataFrame({
-        "PaymentID": [1],
-        "CustomerID": [1],
-        "Amount": [600.00],
-        "Note": ["Payment for multiple invoices"]
-    })
-    df_payments.to_excel(payments_file, sheet_name="Payments", index=False)
+    write_xlsx(payments_file, "Payments", ["PaymentID", "CustomerID", "Amount", "Note"], [
+        [1, 1, 600.00, "Payment for multiple invoices"],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    inv_table = [t["table"] for t in tables["tables"] if "invoices" in t["table"]][0]
-    pay_table = [t["table"] for t in tables["tables"] if "payments" in t["table"]][0]
+    inv_table = server.get_table("invoices")
+    pay_table = server.get_table("payments")
 
     result = server.query(f'''
+        WITH i AS (
+            SELECT CustomerID, SUM(Amount) as TotalInvoiced
+            FROM "{inv_table}"
+            GROUP BY CustomerID
+        )
         SELECT
             i.CustomerID,
-            SUM(i.Amount) as TotalInvoiced,
+            i.TotalInvoiced,
             p.Amount as TotalPaid
-        FROM "{inv_table}" i
+        FROM i
         JOIN "{pay_table}" p ON i.CustomerID = p.CustomerID
-        GROUP BY i.CustomerID, p.Amount
     ''')
 
     assert result["row_count"] == 1
@@ -171,18 +146,15 @@ def test_bulk_payment_covering_multiple_invoices(temp_excel_dir):
 
 def test_voided_payment_scenario(temp_excel_dir):
     payments_file = temp_excel_dir / "payments.xlsx"
-    df_payments = pd.DataFrame({
-        "PaymentID": [1, 2, 3],
-        "InvoiceRef": ["INV-001", "INV-001", "INV-002"],
-        "Amount": [500.00, -500.00, 1000.00],
-        "Status": ["Posted", "Voided", "Posted"]
-    })
-    df_payments.to_excel(payments_file, sheet_name="Payments", index=False)
+    write_xlsx(payments_file, "Payments", ["PaymentID", "InvoiceRef", "Amount", "Status"], [
+        [1, "INV-001", 500.00, "Posted"],
+        [2, "INV-001", -500.00, "Voided"],
+        [3, "INV-002", 1000.00, "Posted"],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    pay_table = [t["table"] for t in tables["tables"] if "payments" in t["table"]][0]
+    pay_table = server.get_table("payments")
 
     result = server.query(f'''
         SELECT
@@ -190,83 +162,78 @@ def test_voided_payment_scenario(temp_excel_dir):
             SUM(Amount) as NetPayment
         FROM "{pay_table}"
         GROUP BY InvoiceRef
+        ORDER BY InvoiceRef
     ''')
 
-    assert result["row_count"] >= 1
+    assert result["row_count"] == 2
+    assert [(row[0], row[1]) for row in result["rows"]] == [("INV-001", 0), ("INV-002", 1000)]
 
 
 def test_payment_applied_to_wrong_invoice(temp_excel_dir):
     invoices_file = temp_excel_dir / "invoices.xlsx"
-    df_invoices = pd.DataFrame({
-        "InvoiceNumber": ["INV-301", "INV-302"],
-        "Amount": [1000.00, 2000.00]
-    })
-    df_invoices.to_excel(invoices_file, sheet_name="Invoices", index=False)
+    write_xlsx(invoices_file, "Invoices", ["InvoiceNumber", "Amount"], [
+        ["INV-301", 1000.00],
+        ["INV-302", 2000.00],
+    ])
 
     payments_original = temp_excel_dir / "payments_original.xlsx"
-    df_pay_orig = pd.DataFrame({
-        "PaymentID": [1],
-        "InvoiceRef": ["INV-302"],
-        "Amount": [1000.00]
-    })
-    df_pay_orig.to_excel(payments_original, sheet_name="Payments", index=False)
+    write_xlsx(payments_original, "Payments", ["PaymentID", "InvoiceRef", "Amount"], [
+        [1, "INV-302", 1000.00],
+    ])
 
     payments_corrected = temp_excel_dir / "payments_corrected.xlsx"
-    df_pay_corr = pd.DataFrame({
-        "PaymentID": [1],
-        "InvoiceRef": ["INV-301"],
-        "Amount": [1000.00],
-        "CorrectedFrom": ["INV-302"]
-    })
-    df_pay_corr.to_excel(payments_corrected, sheet_name="Payments", index=False)
+    write_xlsx(payments_corrected, "Payments", ["PaymentID", "InvoiceRef", "Amount", "CorrectedFrom"], [
+        [1, "INV-301", 1000.00, "INV-302"],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    assert len(tables["tables"]) >= 2
+    assert len(server.list_tables()["tables"]) >= 2
 
 
 def test_credit_memo_applied_to_invoice(temp_excel_dir):
     invoices_file = temp_excel_dir / "invoices.xlsx"
-    df_invoices = pd.DataFrame({
-        "DocumentNumber": ["INV-401", "CM-401"],
-        "Type": ["Invoice", "Credit Memo"],
-        "Amount": [1000.00, -100.00],
-        "RelatedTo": [None, "INV-401"]
-    })
-    df_invoices.to_excel(invoices_file, sheet_name="Documents", index=False)
+    write_xlsx(invoices_file, "Documents", ["DocumentNumber", "Type", "Amount", "RelatedTo"], [
+        ["INV-401", "Invoice", 1000.00, None],
+        ["CM-401", "Credit Memo", -100.00, "INV-401"],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    doc_table = [t["table"] for t in tables["tables"] if "invoices" in t["table"]][0]
+    doc_table = server.get_table("invoices")
 
     result = server.query(f'''
         SELECT
-            RelatedTo as InvoiceNumber,
+            InvoiceNumber,
             SUM(Amount) as NetAmount
-        FROM "{doc_table}"
-        WHERE RelatedTo IS NOT NULL OR DocumentNumber LIKE 'INV%'
-        GROUP BY RelatedTo
+        FROM (
+            SELECT RelatedTo as InvoiceNumber, Amount
+            FROM "{doc_table}"
+            WHERE RelatedTo IS NOT NULL
+            UNION ALL
+            SELECT DocumentNumber, Amount
+            FROM "{doc_table}"
+            WHERE RelatedTo IS NULL AND DocumentNumber LIKE 'INV%'
+        )
+        GROUP BY InvoiceNumber
     ''')
 
-    assert result["row_count"] >= 1
+    assert result["row_count"] == 1
+    assert (result["rows"][0][0], result["rows"][0][1]) == ("INV-401", 900)
 
 
 def test_deposit_vs_payment(temp_excel_dir):
     transactions_file = temp_excel_dir / "transactions.xlsx"
-    df_transactions = pd.DataFrame({
-        "TransactionID": [1, 2, 3, 4],
-        "Type": ["Deposit", "Invoice", "Payment", "Refund"],
-        "Amount": [500.00, -1000.00, 500.00, 100.00],
-        "InvoiceRef": [None, "INV-501", "INV-501", None]
-    })
-    df_transactions.to_excel(transactions_file, sheet_name="Transactions", index=False)
+    write_xlsx(transactions_file, "Transactions", ["TransactionID", "Type", "Amount", "InvoiceRef"], [
+        [1, "Deposit", 500.00, None],
+        [2, "Invoice", -1000.00, "INV-501"],
+        [3, "Payment", 500.00, "INV-501"],
+        [4, "Refund", 100.00, None],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    trans_table = [t["table"] for t in tables["tables"] if "transactions" in t["table"]][0]
+    trans_table = server.get_table("transactions")
 
     result = server.query(f'''
         SELECT
@@ -274,34 +241,30 @@ def test_deposit_vs_payment(temp_excel_dir):
             SUM(Amount) as Total
         FROM "{trans_table}"
         GROUP BY Type
+        ORDER BY Type
     ''')
 
-    assert result["row_count"] >= 3
+    assert result["row_count"] == 4
+    assert [(row[0], row[1]) for row in result["rows"]] == [
+        ("Deposit", 500), ("Invoice", -1000), ("Payment", 500), ("Refund", 100),
+    ]
 
 
 def test_payment_made_before_invoice_issued(temp_excel_dir):
     invoices_file = temp_excel_dir / "invoices.xlsx"
-    df_invoices = pd.DataFrame({
-        "InvoiceNumber": ["INV-601"],
-        "InvoiceDate": [datetime(2024, 1, 20)],
-        "Amount": [1000.00]
-    })
-    df_invoices.to_excel(invoices_file, sheet_name="Invoices", index=False)
+    write_xlsx(invoices_file, "Invoices", ["InvoiceNumber", "InvoiceDate", "Amount"], [
+        ["INV-601", datetime(2024, 1, 20), 1000.00],
+    ])
 
     payments_file = temp_excel_dir / "payments.xlsx"
-    df_payments = pd.DataFrame({
-        "PaymentID": [1],
-        "InvoiceRef": ["INV-601"],
-        "PaymentDate": [datetime(2024, 1, 15)],
-        "Amount": [1000.00]
-    })
-    df_payments.to_excel(payments_file, sheet_name="Payments", index=False)
+    write_xlsx(payments_file, "Payments", ["PaymentID", "InvoiceRef", "PaymentDate", "Amount"], [
+        [1, "INV-601", datetime(2024, 1, 15), 1000.00],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    inv_table = [t["table"] for t in tables["tables"] if "invoices" in t["table"]][0]
-    pay_table = [t["table"] for t in tables["tables"] if "payments" in t["table"]][0]
+    inv_table = server.get_table("invoices")
+    pay_table = server.get_table("payments")
 
     result = server.query(f'''
         SELECT
@@ -318,28 +281,19 @@ def test_payment_made_before_invoice_issued(temp_excel_dir):
 
 def test_foreign_currency_payment_reconciliation(temp_excel_dir):
     invoices_file = temp_excel_dir / "invoices.xlsx"
-    df_invoices = pd.DataFrame({
-        "InvoiceNumber": ["INV-701"],
-        "Amount_USD": [1000.00],
-        "Currency": ["USD"]
-    })
-    df_invoices.to_excel(invoices_file, sheet_name="Invoices", index=False)
+    write_xlsx(invoices_file, "Invoices", ["InvoiceNumber", "Amount_USD", "Currency"], [
+        ["INV-701", 1000.00, "USD"],
+    ])
 
     payments_file = temp_excel_dir / "payments.xlsx"
-    df_payments = pd.DataFrame({
-        "PaymentID": [1],
-        "InvoiceRef": ["INV-701"],
-        "Amount_EUR": [850.00],
-        "Currency": ["EUR"],
-        "ExchangeRate": [1.18]
-    })
-    df_payments.to_excel(payments_file, sheet_name="Payments", index=False)
-
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
-
-    tables = server.list_tables()
-    inv_table = [t["table"] for t in tables["tables"] if "invoices" in t["table"]][0]
-    pay_table = [t["table"] for t in tables["tables"] if "payments" in t["table"]][0]
+    write_xlsx(payments_file, "Payments", ["PaymentID", "InvoiceRef", "Amount_EUR", "Currency", "ExchangeRate"], [
+        [1, "INV-701", 850.00, "EUR", 1.18],
+    ])
+
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
+
+    inv_table = server.get_table("invoices")
+    pay_table = server.get_table("payments")
 
     result = server.query(f'''
         SELECT
@@ -1,61 +1,38 @@
 import pytest
-from pathlib import Path
+import numpy as np
 import pandas as pd
 import mcp_excel.server as server
-
-
-def setup_overrides_for_all_files(temp_dir):
-    """Create overrides dict that applies header_rows=1 to all Excel files"""
-    from pathlib import Path
-    overrides = {}
-    for f in Path(temp_dir).glob("*.xlsx"):
-        overrides[f.name] = {"sheet_overrides": {}}
-        # Get all sheets
-        import openpyxl
-        try:
-            wb = openpyxl.load_workbook(f, read_only=True)
-            for sheet_name in wb.sheetnames:
-                overrides[f.name]["sheet_overrides"][sheet_name] = {"header_rows": 1}
-            wb.close()
-        except:
-            pass
-    return overrides
+from tests.conftest import write_xlsx, write_xlsx_frame
 
 
 pytestmark = [pytest.mark.integration, pytest.mark.usefixtures("setup_server")]
 
 
 def test_columns_added_across_monthly_files(temp_excel_dir):
-    for month in range(1, 13):
+    months = np.arange(1, 13)
+    sales = pd.DataFrame({
+        "Date": [f"2024-{month:02d}-01" for month in months],
+        "Product": "Widget A",
+        "Revenue": months * 1000,
+        "Region": "North",
+        "SalesRep": "Alice"
+    })
+
+    for month in months:
         file_path = temp_excel_dir / f"sales_month_{month:02d}.xlsx"
+        columns = ["Date", "Product", "Revenue"] if month <= 6 else list(sales.columns)
+        write_xlsx_frame(file_path, "Sales", sales.iloc[month - 1:month][columns])
 
-        if month <= 6:
-            df = pd.DataFrame({
-                "Date": [f"2024-{month:02d}-01"],
-                "Product": ["Widget A"],
-                "Revenue": [1000 * month]
-            })
-        else:
-            df = pd.DataFrame({
-                "Date": [f"2024-{month:02d}-01"],
-                "Product": ["Widget A"],
-                "Revenue": [1000 * month],
-                "Region": ["North"],
-                "SalesRep": ["Alice"]
-            })
-
-        df.to_excel(file_path, sheet_name="Sales", index=False)
-
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
     tables = server.list_tables()
     assert len(tables["tables"]) == 12
 
-    early_table = [t for t in tables["tables"] if "month_01" in t["table"]][0]
-    late_table = [t for t in tables["tables"] if "month_12" in t["table"]][0]
+    early_table = server.get_table("month_01")
+    late_table = server.get_table("month_12")
 
-    early_schema = server.get_schema(early_table["table"])
-    late_schema = server.get_schema(late_table["table"])
+    early_schema = server.get_schema(early_table)
+    late_schema = server.get_schema(late_table)
 
     early_cols = {col["name"] for col in early_schema["columns"]}
     late_cols = {col["name"] for col in late_schema["columns"]}
@@ -65,26 +42,20 @@ def test_columns_added_across_monthly_files(temp_excel_dir):
 
 
 def test_columns_removed_mid_year(temp_excel_dir):
-    for month in range(1, 7):
-        file_path = temp_excel_dir / f"report_{month:02d}.xlsx"
-
-        if month <= 3:
-            df = pd.DataFrame({
-                "ID": [month],
-                "Value": [100 * month],
-                "LegacyField": [f"Legacy{month}"],
-                "Status": ["Active"]
-            })
-        else:
-            df = pd.DataFrame({
-                "ID": [month],
-                "Value": [100 * month],
-                "Status": ["Active"]
-            })
+    months = np.arange(1, 7)
+    reports = pd.DataFrame({
+        "ID": months,
+        "Value": months * 100,
+        "LegacyField": [f"Legacy{month}" for month in months],
+        "Status": "Active"
+    })
 
-        df.to_excel(file_path, sheet_name="Data", index=False)
+    for month in months:
+        file_path = temp_excel_dir / f"report_{month:02d}.xlsx"
+        columns = list(reports.columns) if month <= 3 else ["ID", "Value", "Status"]
+        write_xlsx_frame(file_path, "Data", reports.iloc[month - 1:month][columns])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
     tables = server.list_tables()
     assert len(tables["tables"]) == 6
@@ -92,28 +63,28 @@ def test_columns_removed_mid_year(temp_excel_dir):
 
 def test_column_renamed_across_files(temp_excel_dir):
     file1 = temp_excel_dir / "q1_data.xlsx"
-    df1 = pd.DataFrame({
-        "CustomerID": [1, 2, 3],
-        "Revenue": [1000, 2000, 3000],
-        "Sales_Rep": ["Alice", "Bob", "Charlie"]
-    })
-    df1.to_excel(file1, sheet_name="Data", index=False)
+    write_xlsx(file1, "Data", ["CustomerID", "Revenue", "Sales_Rep"], [
+        [1, 1000, "Alice"],
+        [2, 2000, "Bob"],
+        [3, 3000, "Charlie"],
+    ])
 
     file2 = temp_excel_dir / "q2_data.xlsx"
-    df2 = pd.DataFrame({
-        "CustomerID": [4, 5, 6],
-        "Revenue": [1500, 2500, 3500],
-        "SalesRepresentative": ["Diana", "Eve", "Frank"]
-    })
-    df2.to_excel(file2, sheet_name="Data", index=False)
+    write_xlsx(file2, "Data", ["CustomerID", "Revenue", "SalesRepresentative"], [
+        [4, 1500, "Diana"],
+        [5, 2500, "Eve"],
+        [6, 3500, "Frank"],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
     tables = server.list_tables()
     assert len(tables["tables"]) == 2
 
-    q1_schema = server.get_schema([t["table"] for t in tables["tables"] if "q1" in t["table"]][0])
-    q2_schema = server.get_schema([t["table"] for t in tables["tables"] if "q2" in t["table"]][0])
+    q1_table = server.get_table("q1")
+    q2_table = server.get_table("q2")
+    q1_schema = server.get_schema(q1_table)
+    q2_schema = server.get_schema(q2_table)
 
     q1_cols = {col["name"] for col in q1_schema["columns"]}
     q2_cols = {col["name"] for col in q2_schema["columns"]}
@@ -123,26 +94,19 @@ def test_column_renamed_across_files(temp_excel_dir):
 
 def test_column_order_changed(temp_excel_dir):
     file1 = temp_excel_dir / "version1.xlsx"
-    df1 = pd.DataFrame({
-        "Name": ["Alice"],
-        "Age": [30],
-        "City": ["NYC"]
-    })
-    df1.to_excel(file1, sheet_name="People", index=False)
+    write_xlsx(file1, "People", ["Name", "Age", "City"], [
+        ["Alice", 30, "NYC"],
+    ])
 
     file2 = temp_excel_dir / "version2.xlsx"
-    df2 = pd.DataFrame({
-        "City": ["LA"],
-        "Name": ["Bob"],
-        "Age": [25]
-    })
-    df2.to_excel(file2, sheet_name="People", index=False)
+    write_xlsx(file2, "People", ["City", "Name", "Age"], [
+        ["LA", "Bob", 25],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    table1 = [t["table"] for t in tables["tables"] if "version1" in t["table"]][0]
-    table2 = [t["table"] for t in tables["tables"] if "version2" in t["table"]][0]
+    table1 = server.get_table("version1")
+    table2 = server.get_table("version2")
 
     result1 = server.query(f'SELECT * FROM "{table1}"')
     result2 = server.query(f'SELECT * FROM "{table2}"')
@@ -153,60 +117,51 @@ def test_column_order_changed(temp_excel_dir):
 
 def test_data_type_changed_same_column(temp_excel_dir):
     file1 = temp_excel_dir / "jan_data.xlsx"
-    df1 = pd.DataFrame({
-        "ID": ["A001", "A002", "A003"],
-        "Amount": [100, 200, 300]
-    })
-    df1.to_excel(file1, sheet_name="Transactions", index=False)
+    write_xlsx(file1, "Transactions", ["ID", "Amount"], [
+        ["A001", 100],
+        ["A002", 200],
+        ["A003", 300],
+    ])
 
     file2 = temp_excel_dir / "feb_data.xlsx"
-    df2 = pd.DataFrame({
-        "ID": [1001, 1002, 1003],
-        "Amount": [150, 250, 350]
-    })
-    df2.to_excel(file2, sheet_name="Transactions", index=False)
+    write_xlsx(file2, "Transactions", ["ID", "Amount"], [
+        [1001, 150],
+        [1002, 250],
+        [1003, 350],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
     tables = server.list_tables()
     assert len(tables["tables"]) == 2
 
-    jan_table = [t["table"] for t in tables["tables"] if "jan" in t["table"]][0]
-    feb_table = [t["table"] for t in tables["tables"] if "feb" in t["table"]][0]
+    jan_table = server.get_table("jan")
+    feb_table = server.get_table("feb")
 
     jan_schema = server.get_schema(jan_table)
     feb_schema = server.get_schema(feb_table)
 
-    jan_id_type = [col["type"] for col in jan_schema["columns"] if col["name"] == "ID"][0]
-    feb_id_type = [col["type"] for col in feb_schema["columns"] if col["name"] == "ID"][0]
+    jan_id_type = next(col["type"] for col in jan_schema["columns"] if col["name"] == "ID")
+    feb_id_type = next(col["type"] for col in feb_schema["columns"] if col["name"] == "ID")
 
     assert jan_id_type != feb_id_type or True
 
 
 def test_header_row_position_changed(temp_excel_dir):
     file1 = temp_excel_dir / "standard.xlsx"
-    df1 = pd.DataFrame({
-        "Product": ["Widget A"],
-        "Price": [100]
-    })
-    df1.to_excel(file1, sheet_name="Prices", index=False)
+    write_xlsx(file1, "Prices", ["Product", "Price"], [
+        ["Widget A", 100],
+    ])
 
     file2 = temp_excel_dir / "with_title.xlsx"
-    wb = pd.ExcelWriter(file2, engine='openpyxl')
-    df2 = pd.DataFrame({
-        "": ["Company Report"],
-        "Unnamed: 1": [""],
-    })
-    df2.to_excel(wb, sheet_name="Prices", index=False, header=False, startrow=0)
+    # Title row, a blank row, then the real header on row 3
+    write_xlsx(file2, "Prices", ["Company Report", ""], [
+        [],
+        ["Product", "Price"],
+        ["Widget B", 200],
+    ])
 
-    df3 = pd.DataFrame({
-        "Product": ["Widget B"],
-        "Price": [200]
-    })
-    df3.to_excel(wb, sheet_name="Prices", index=False, startrow=2)
-    wb.close()
-
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
     tables = server.list_tables()
     assert len(tables["tables"]) >= 1
@@ -214,22 +169,18 @@ def test_header_row_position_changed(temp_excel_dir):
 
 def test_extra_columns_with_all_nulls(temp_excel_dir):
     file1 = temp_excel_dir / "compact.xlsx"
-    df1 = pd.DataFrame({
-        "Name": ["Alice", "Bob"],
-        "Score": [90, 85]
-    })
-    df1.to_excel(file1, sheet_name="Scores", index=False)
+    write_xlsx(file1, "Scores", ["Name", "Score"], [
+        ["Alice", 90],
+        ["Bob", 85],
+    ])
 
     file2 = temp_excel_dir / "expanded.xlsx"
-    df2 = pd.DataFrame({
-        "Name": ["Charlie", "Diana"],
-        "Score": [88, 92],
-        "Bonus": [None, None],
-        "Notes": [None, None]
-    })
-    df2.to_excel(file2, sheet_name="Scores", index=False)
+    write_xlsx(file2, "Scores", ["Name", "Score", "Bonus", "Notes"], [
+        ["Charlie", 88, None, None],
+        ["Diana", 92, None, None],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
     tables = server.list_tables()
     assert len(tables["tables"]) == 2
@@ -237,52 +188,42 @@ def test_extra_columns_with_all_nulls(temp_excel_dir):
 
 def test_union_query_with_schema_mismatch(temp_excel_dir):
     file1 = temp_excel_dir / "dataset_a.xlsx"
-    df1 = pd.DataFrame({
-        "ID": [1, 2],
-        "Value": [100, 200]
-    })
-    df1.to_excel(file1, sheet_name="Data", index=False)
+    write_xlsx(file1, "Data", ["ID", "Value"], [
+        [1, 100],
+        [2, 200],
+    ])
 
     file2 = temp_excel_dir / "dataset_b.xlsx"
-    df2 = pd.DataFrame({
-        "ID": [3, 4],
-        "Value": [300, 400],
-        "Extra": ["X", "Y"]
-    })
-    df2.to_excel(file2, sheet_name="Data", index=False)
+    write_xlsx(file2, "Data", ["ID", "Value", "Extra"], [
+        [3, 300, "X"],
+        [4, 400, "Y"],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
-    tables = server.list_tables()
-    table_a = [t["table"] for t in tables["tables"] if "dataset_a" in t["table"]][0]
-    table_b = [t["table"] for t in tables["tables"] if "dataset_b" in t["table"]][0]
+    table_a = server.get_table("dataset_a")
+    table_b = server.get_table("dataset_b")
 
+    # Mismatched column types may make the union fail; a wrong row count must not pass silently
     try:
         result = server.query(f'SELECT ID, Value FROM "{table_a}" UNION ALL SELECT ID, Value FROM "{table_b}"')
-        assert result["row_count"] == 4
-    except:
-        pass
+    except RuntimeError:
+        return
+    assert result["row_count"] == 4
 
 
 def test_columns_inserted_in_middle(temp_excel_dir):
     file1 = temp_excel_dir / "original.xlsx"
-    df1 = pd.DataFrame({
-        "FirstName": ["Alice"],
-        "LastName": ["Smith"],
-        "Email": ["alice@example.com"]
-    })
-    df1.to_excel(file1, sheet_name="Contacts", index=False)
+    write_xlsx(file1, "Contacts", ["FirstName", "LastName", "Email"], [
+        ["Alice", "Smith", "alice@example.com"],
+    ])
 
     file2 = temp_excel_dir / "updated.xlsx"
-    df2 = pd.DataFrame({
-        "FirstName": ["Bob"],
-        "MiddleName": ["J"],
-        "LastName": ["Jones"],
-        "Email": ["bob@example.com"]
-    })
-    df2.to_excel(file2, sheet_name="Contacts", index=False)
+    write_xlsx(file2, "Contacts", ["FirstName", "MiddleName", "LastName", "Email"], [
+        ["Bob", "J", "Jones", "bob@example.com"],
+    ])
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), default_sheet_overrides={"header_rows": 1})
 
     tables = server.list_tables()
     assert len(tables["tables"]) == 2
@@ -5,28 +5,10 @@ from datetime import datetime, timedelta
 import mcp_excel.server as server
 
 
-def setup_overrides_for_all_files(temp_dir):
-    """Create overrides dict that applies header_rows=1 to all Excel files"""
-    from pathlib import Path
-    overrides = {}
-    for f in Path(temp_dir).glob("*.xlsx"):
-        overrides[f.name] = {"sheet_overrides": {}}
-        # Get all sheets
-        import openpyxl
-        try:
-            wb = openpyxl.load_workbook(f, read_only=True)
-            for sheet_name in wb.sheetnames:
-                overrides[f.name]["sheet_overrides"][sheet_name] = {"header_rows": 1}
-            wb.close()
-        except:
-            pass
-    return overrides
-
-
 pytestmark = [pytest.mark.integration, pytest.mark.usefixtures("setup_server")]
 
 
-def test_deal_closed_vs_revenue_booked_dates(temp_excel_dir):
+def test_deal_closed_vs_revenue_booked_dates(temp_excel_dir, overrides_builder):
     deals_file = temp_excel_dir / "deals.xlsx"
     df_deals = pd.DataFrame({
         "DealID": ["D001", "D002", "D003"],
@@ -51,7 +33,7 @@ def test_deal_closed_vs_revenue_booked_dates(temp_excel_dir):
     })
     df_revenue.to_excel(revenue_file, sheet_name="Revenue", index=False)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
     deals_table = [t["table"] for t in tables["tables"] if "deals" in t["table"]][0]
@@ -70,7 +52,7 @@ def test_deal_closed_vs_revenue_booked_dates(temp_excel_dir):
     assert result["row_count"] == 3
 
 
-def test_order_vs_shipment_lag(temp_excel_dir):
+def test_order_vs_shipment_lag(temp_excel_dir, overrides_builder):
     orders_file = temp_excel_dir / "orders.xlsx"
     df_orders = pd.DataFrame({
         "OrderID": [1, 2, 3, 4],
@@ -97,7 +79,7 @@ def test_order_vs_shipment_lag(temp_excel_dir):
     })
     df_shipments.to_excel(shipments_file, sheet_name="Shipments", index=False)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
     orders_table = [t["table"] for t in tables["tables"] if "orders" in t["table"]][0]
@@ -115,7 +97,7 @@ def test_order_vs_shipment_lag(temp_excel_dir):
     assert result["row_count"] >= 1
 
 
-def test_invoice_date_vs_payment_date_lag(temp_excel_dir):
+def test_invoice_date_vs_payment_date_lag(temp_excel_dir, overrides_builder):
     invoices_file = temp_excel_dir / "invoices.xlsx"
     df_invoices = pd.DataFrame({
         "InvoiceNumber": ["INV001", "INV002", "INV003"],
@@ -145,7 +127,7 @@ def test_invoice_date_vs_payment_date_lag(temp_excel_dir):
     })
     df_payments.to_excel(payments_file, sheet_name="Payments", index=False)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
     inv_table = [t["table"] for t in tables["tables"] if "invoices" in t["table"]][0]
@@ -165,7 +147,7 @@ def test_invoice_date_vs_payment_date_lag(temp_excel_dir):
     assert result["row_count"] >= 1
 
 
-def test_purchase_order_vs_receipt_lag(temp_excel_dir):
+def test_purchase_order_vs_receipt_lag(temp_excel_dir, overrides_builder):
     po_file = temp_excel_dir / "purchase_orders.xlsx"
     df_po = pd.DataFrame({
         "PONumber": ["PO-001", "PO-002", "PO-003"],
@@ -194,7 +176,7 @@ def test_purchase_order_vs_receipt_lag(temp_excel_dir):
     })
     df_receipts.to_excel(receipts_file, sheet_name="Receipts", index=False)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
     po_table = [t["table"] for t in tables["tables"] if "purchase" in t["table"]][0]
@@ -216,7 +198,7 @@ def test_purchase_order_vs_receipt_lag(temp_excel_dir):
     assert result["row_count"] == 3
 
 
-def test_transaction_timestamp_vs_settlement_date(temp_excel_dir):
+def test_transaction_timestamp_vs_settlement_date(temp_excel_dir, overrides_builder):
     transactions_file = temp_excel_dir / "transactions.xlsx"
     df_trans = pd.DataFrame({
         "TransactionID": [1, 2, 3],
@@ -240,7 +222,7 @@ def test_transaction_timestamp_vs_settlement_date(temp_excel_dir):
     })
     df_settle.to_excel(settlements_file, sheet_name="Settlements", index=False)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
     trans_table = [t["table"] for t in tables["tables"] if "transactions" in t["table"]][0]
@@ -258,7 +240,7 @@ def test_transaction_timestamp_vs_settlement_date(temp_excel_dir):
     assert result["row_count"] == 3
 
 
-def test_backdated_entries(temp_excel_dir):
+def test_backdated_entries(temp_excel_dir, overrides_builder):
     ledger_file = temp_excel_dir / "ledger.xlsx"
     df_ledger = pd.DataFrame({
         "EntryID": [1, 2, 3],
@@ -276,7 +258,7 @@ def test_backdated_entries(temp_excel_dir):
     })
     df_ledger.to_excel(ledger_file, sheet_name="Ledger", index=False)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
     ledger_table = [t["table"] for t in tables["tables"] if "ledger" in t["table"]][0]
@@ -290,7 +272,7 @@ def test_backdated_entries(temp_excel_dir):
     assert result["row_count"] >= 1
 
 
-def test_timezone_differences_in_timestamps(temp_excel_dir):
+def test_timezone_differences_in_timestamps(temp_excel_dir, overrides_builder):
     eastern_file = temp_excel_dir / "eastern_time.xlsx"
     df_eastern = pd.DataFrame({
         "EventID": [1],
@@ -307,13 +289,13 @@ def test_timezone_differences_in_timestamps(temp_excel_dir):
     })
     df_pacific.to_excel(pacific_file, sheet_name="Events", index=False)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
     assert len(tables["tables"]) == 2
 
 
-def test_month_end_cutoff_differences(temp_excel_dir):
+def test_month_end_cutoff_differences(temp_excel_dir, overrides_builder):
     january_file = temp_excel_dir / "january_cutoff.xlsx"
     df_jan = pd.DataFrame({
         "TransactionID": [1, 2],
@@ -326,7 +308,7 @@ def test_month_end_cutoff_differences(temp_excel_dir):
     })
     df_jan.to_excel(january_file, sheet_name="Transactions", index=False)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
     trans_table = [t["table"] for t in tables["tables"] if "january" in t["table"]][0]
@@ -342,7 +324,7 @@ def test_month_end_cutoff_differences(temp_excel_dir):
     assert result["row_count"] >= 1
 
 
-def test_effective_date_vs_entry_date(temp_excel_dir):
+def test_effective_date_vs_entry_date(temp_excel_dir, overrides_builder):
     journal_file = temp_excel_dir / "journal_entries.xlsx"
     df_journal = pd.DataFrame({
         "EntryID": [1, 2, 3],
@@ -360,7 +342,7 @@ def test_effective_date_vs_entry_date(temp_excel_dir):
     })
     df_journal.to_excel(journal_file, sheet_name="Journal", index=False)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
     journal_table = [t["table"] for t in tables["tables"] if "journal" in t["table"]][0]
@@ -377,7 +359,7 @@ def test_effective_date_vs_entry_date(temp_excel_dir):
     assert result["row_count"] >= 1
 
 
-def test_accrual_vs_cash_basis_timing(temp_excel_dir):
+def test_accrual_vs_cash_basis_timing(temp_excel_dir, overrides_builder):
     revenue_file = temp_excel_dir / "revenue.xlsx"
     df_revenue = pd.DataFrame({
         "InvoiceID": [1, 2, 3],
@@ -400,7 +382,7 @@ def test_accrual_vs_cash_basis_timing(temp_excel_dir):
     })
     df_revenue.to_excel(revenue_file, sheet_name="Revenue", index=False)
 
-    server.load_dir(str(temp_excel_dir), overrides=setup_overrides_for_all_files(temp_excel_dir))
+    server.load_dir(str(temp_excel_dir), overrides=overrides_builder())
 
     tables = server.list_tables()
     revenue_table = [t["table"] for t in tables["tables"] if "revenue" in t["table"]][0]
@@ -3,6 +3,7 @@ import csv
 import pytest
 from pathlib import Path
 import pandas as pd
+from datetime import datetime
 import openpyxl
 
 import mcp_excel.server as server
@@ -124,6 +125,53 @@ class TestFormatHandlers:
         assert is_valid
         assert error is None
 
+    def test_xlsx_handler_calamine_matches_openpyxl(self, temp_dir, monkeypatch):
+        pytest.importorskip("python_calamine")
+
+        xlsx_file = temp_dir / "test.xlsx"
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "Data"
+        ws.append(["Name", "Value", "Note"])
+        ws.append(["A", 100, None])
+        ws.append(["B", 200.5, "x"])
+        wb.save(xlsx_file)
+
+        handler = XLSXHandler()
+        options = ParseOptions(header_rows=1, merge_strategy='skip', ignore_hidden=False)
+        df_calamine = handler.parse(xlsx_file, "Data", options)
+        assert handler.get_sheets(xlsx_file) == ["Data"]
+
+        monkeypatch.setattr(handler, "_read_with_calamine", lambda *args: None)
+        df_openpyxl = handler.parse(xlsx_file, "Data", options)
+
+        pd.testing.assert_frame_equal(df_calamine, df_openpyxl, check_dtype=False)
+
+    def test_xlsx_handler_calamine_offset_sheet_with_dates(self, temp_dir, monkeypatch):
+        pytest.importorskip("python_calamine")
+
+        xlsx_file = temp_dir / "offset.xlsx"
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = "Data"
+        ws["B3"], ws["C3"], ws["D3"] = "Name", "Qty", "When"
+        ws["B4"], ws["C4"], ws["D4"] = "a", 1, datetime(2024, 1, 1)
+        ws["B5"], ws["C5"], ws["D5"] = "b", 2, datetime(2024, 1, 2, 13, 30)
+        ws["B6"], ws["C6"], ws["D6"] = "c", 3, datetime(2024, 1, 3)
+        wb.save(xlsx_file)
+
+        handler = XLSXHandler()
+        options = ParseOptions(header_rows=1, skip_rows=2, merge_strategy='skip', ignore_hidden=False)
+        df_calamine = handler.parse(xlsx_file, "Data", options)
+
+        monkeypatch.setattr(handler, "_read_with_calamine", lambda *args: None)
+        df_openpyxl = handler.parse(xlsx_file, "Data", options)
+
+        assert list(df_calamine.columns) == list(df_openpyxl.columns)
+        assert len(df_calamine) == 3
+        assert pd.api.types.is_datetime64_any_dtype(df_calamine["When"])
+        pd.testing.assert_frame_equal(df_calamine, df_openpyxl, check_dtype=False)
+
     def test_csv_handler(self, temp_dir):
         # Create CSV file
         csv_file = temp_dir / "test.csv"
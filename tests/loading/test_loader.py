@@ -82,6 +82,30 @@ def test_column_renames(temp_dir, loader):
     assert "NewName" in column_names or "newname" in column_names
 
 
+def test_normalize_columns(temp_dir, loader):
+    file_path = temp_dir / "normalize_test.xlsx"
+    df = pd.DataFrame({
+        "Company": ["Apple, Inc.", "  Société   Générale ", None],
+        "Revenue": [1, 2, 3]
+    })
+    df.to_excel(file_path, sheet_name="Data", index=False)
+
+    override = SheetOverride(header_rows=1, normalize_columns=["Company", "Missing"])
+    metas = loader.load_sheet(file_path, "normalize_test.xlsx", "Data", "excel", override)
+    meta = metas[0]
+
+    result = loader.conn.execute(f'SELECT "__norm_Company" FROM "{meta.table_name}"').fetchall()
+    assert [row[0] for row in result] == ["apple inc", "societe generale", None]
+
+
+def test_register_frame_handles_mixed_object_columns(loader):
+    df = pd.DataFrame({"Mixed": [1, "a", None], "Name": ["x", "y", "z"]})
+    loader._register_frame("temp_mixed", df)
+
+    result = loader.conn.execute('SELECT "Name" FROM temp_mixed ORDER BY "Name"').fetchall()
+    assert [row[0] for row in result] == ["x", "y", "z"]
+
+
 def test_get_sheet_names(loader, sample_excel):
     sheets = loader.get_sheet_names(sample_excel)
     assert "Data" in sheets
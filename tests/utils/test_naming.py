@@ -59,6 +59,10 @@ class TestTableRegistry:
         name = self.registry.register("excel", "folder/data.xlsx", "Sheet1")
         assert name == "excel.folder.data.sheet1"
 
+    def test_dotted_folder_keeps_file_name(self):
+        name = self.registry.register("excel", "release.v2/data", "Sheet1")
+        assert name == "excel.releasev2.data.sheet1"
+
     def test_subfolder_hierarchy(self):
         name = self.registry.register("excel", "cnc/job_orders.xlsx", "Orders")
         assert name == "excel.cnc.job_orders.orders"
@@ -165,3 +169,10 @@ class TestRegistryMethods:
 
         assert len(names) == 50
         assert len(set(names)) == len(names)
+
+    def test_single_threaded_registry(self):
+        registry = TableRegistry(thread_safe=False)
+        name1 = registry.register("excel", "data.xlsx", "Sheet")
+        name2 = registry.register("excel", "data.xlsx", "Sheet")
+        assert name1 == "excel.data.sheet"
+        assert name2 == "excel.data.sheet_2"
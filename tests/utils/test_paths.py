@@ -0,0 +1,85 @@
+import fnmatch
+import glob
+import warnings
+import pytest
+from mcp_excel.utils.paths import compile_glob, compile_exclude_globs, walk_files
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def tree(temp_dir):
+    for relpath in ["a.xlsx", "b.csv", "sub/c.xlsx", "sub/deep/d.xlsx", "sub/e.tsv"]:
+        file_path = temp_dir / relpath
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text("x")
+    (temp_dir / "folder.xlsx").mkdir()
+    return temp_dir
+
+
+@pytest.mark.parametrize("pattern", [
+    "**/*.xlsx",
+    "*.xlsx",
+    "sub/*.xlsx",
+    "sub/**/*.xlsx",
+    "**/[ab].*",
+    "**/?.tsv",
+])
+def test_compile_glob_matches_pathlib(tree, pattern):
+    expected = sorted(
+        str(p.relative_to(tree)).replace("\\", "/")
+        for p in tree.glob(pattern) if p.is_file()
+    )
+    glob_re = compile_glob(pattern)
+    actual = sorted(
+        relpath.replace("\\", "/")
+        for relpath, _ in walk_files(str(tree))
+        if glob_re.match(relpath.replace("\\", "/"))
+    )
+    assert actual == expected
+
+
+@pytest.mark.parametrize("pattern", ["[^a]b.xlsx", "[[]b.xlsx", "[]]b.xlsx", "[!]]b.xlsx", "[!a]b.xlsx"])
+@pytest.mark.parametrize("name", ["ab.xlsx", "xb.xlsx", "^b.xlsx", "[b.xlsx", "]b.xlsx", "!b.xlsx"])
+def test_compile_glob_brackets_match_fnmatch(pattern, name):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        glob_re = compile_glob(pattern)
+    assert bool(glob_re.match(name)) is fnmatch.fnmatchcase(name, pattern)
+
+
+def test_compile_glob_escaped_path_is_literal():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        glob_re = compile_glob(glob.escape("reports/[draft]/a?.xlsx"))
+    assert glob_re.match("reports/[draft]/a?.xlsx")
+    assert not glob_re.match("reports/d/ab.xlsx")
+
+
+def test_walk_files_skips_directories(tree):
+    relpaths = [relpath.replace("\\", "/") for relpath, _ in walk_files(str(tree))]
+    assert "folder.xlsx" not in relpaths
+    assert "sub/deep/d.xlsx" in relpaths
+
+
+def test_walk_files_lists_files_before_subdirectories(tree):
+    relpaths = [relpath.replace("\\", "/") for relpath, _ in walk_files(str(tree))]
+    assert relpaths.index("a.xlsx") < relpaths.index("sub/c.xlsx")
+    assert relpaths.index("sub/c.xlsx") < relpaths.index("sub/deep/d.xlsx")
+
+
+def test_compile_exclude_globs_empty():
+    assert compile_exclude_globs([]) is None
+
+
+@pytest.mark.parametrize("relpath,excluded", [
+    ("a.csv", True),
+    ("sub/deep/b.csv", True),
+    ("tmp/c.xlsx", True),
+    ("sub/tmp/d.xlsx", True),
+    ("sub/e.xlsx", False),
+    ("tmpfile.xlsx", False),
+])
+def test_compile_exclude_globs_matches_from_right(relpath, excluded):
+    exclude_re = compile_exclude_globs(["*.csv", "tmp/*"])
+    assert bool(exclude_re.match(relpath)) is excluded